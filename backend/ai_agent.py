@@ -1,41 +1,202 @@
 import os
-from datetime import datetime, timedelta
-from openai import OpenAI
+import re
+import math
+import asyncio
+import time
+import functools
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from openai import AsyncOpenAI, NotFoundError, OpenAI
 from dotenv import load_dotenv
 
 # ----------------- API Initialization -----------------
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+@functools.cache
+def _api_key():
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("❌ Missing OPENAI_API_KEY in .env file. Please add it before running.")
+    return api_key
 
-if not api_key:
-    raise ValueError("❌ Missing OPENAI_API_KEY in .env file. Please add it before running.")
 
-client = OpenAI(api_key=api_key)
+@functools.cache
+def get_client():
+    """Lazily build the shared OpenAI client on first use (not at import)."""
+    return OpenAI(api_key=_api_key())
+
+
+@functools.cache
+def get_async_client():
+    """Lazily build the shared AsyncOpenAI client; keeps pooled keep-alive connections."""
+    return AsyncOpenAI(api_key=_api_key())
+
+
+# ----------------- Model Selection -----------------
+CHAT_MODEL = "gpt-5-mini"
+FALLBACK_CHAT_MODEL = "gpt-4o-mini"
+_chat_model = CHAT_MODEL  # switched once, for good, if CHAT_MODEL is unavailable
+
+
+def _complete(messages):
+    """Chat completion on the selected model, downgrading once on a 404."""
+    global _chat_model
+    try:
+        return get_client().chat.completions.create(model=_chat_model, messages=messages, temperature=0)
+    except NotFoundError:
+        if _chat_model == FALLBACK_CHAT_MODEL:
+            raise
+        _chat_model = FALLBACK_CHAT_MODEL
+        return get_client().chat.completions.create(model=_chat_model, messages=messages, temperature=0)
+
+
+async def _acomplete(messages):
+    """Async twin of _complete."""
+    global _chat_model
+    try:
+        return await get_async_client().chat.completions.create(model=_chat_model, messages=messages, temperature=0)
+    except NotFoundError:
+        if _chat_model == FALLBACK_CHAT_MODEL:
+            raise
+        _chat_model = FALLBACK_CHAT_MODEL
+        return await get_async_client().chat.completions.create(model=_chat_model, messages=messages, temperature=0)
+
+
+async def _astream(messages):
+    """Streaming variant of _acomplete; returns the async chunk iterator."""
+    global _chat_model
+    try:
+        return await get_async_client().chat.completions.create(
+            model=_chat_model, messages=messages, temperature=0, stream=True)
+    except NotFoundError:
+        if _chat_model == FALLBACK_CHAT_MODEL:
+            raise
+        _chat_model = FALLBACK_CHAT_MODEL
+        return await get_async_client().chat.completions.create(
+            model=_chat_model, messages=messages, temperature=0, stream=True)
 
 
 # ----------------- Helper: Safe Date Parsing -----------------
+@functools.lru_cache(maxsize=4096)  # due dates repeat a lot; results are immutable
 def safe_parse_date(date_str):
-    """Safely parse a date string (YYYY-MM-DD) and return datetime object."""
+    """
+    Safely parse a date string (YYYY-MM-DD) and return a date object.
+    Slices the canonical zero-padded layout directly; anything else
+    (e.g. '2025-1-5') falls back to strptime.
+    """
+    if not isinstance(date_str, str):
+        return None
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except (ValueError, TypeError):
+        if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+            return date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+# ----------------- Helper: Reply Cache -----------------
+PRIORITY_CACHE_TTL = 3600  # seconds; priorities depend on "today", so expire hourly
+REPLY_CACHE_SIZE = 4096
+_reply_cache = OrderedDict()
+_reply_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    """LRU lookup shared by the sync and async AI helpers."""
+    with _reply_cache_lock:
+        reply = _reply_cache.get(key)
+        if reply is not None:
+            _reply_cache.move_to_end(key)
+        return reply
+
+
+def _cache_put(key, reply):
+    with _reply_cache_lock:
+        _reply_cache[key] = reply
+        _reply_cache.move_to_end(key)
+        if len(_reply_cache) > REPLY_CACHE_SIZE:
+            _reply_cache.popitem(last=False)
+
+
+def _normalize(text):
+    """Collapse whitespace and case so trivially different prompts share a cache key."""
+    return " ".join((text or "").split()).lower()
+
+
+def _days_until(due_date):
+    """Quantize a due date to whole days from today (None if missing/invalid)."""
+    due_dt = safe_parse_date(due_date)
+    if not due_dt:
         return None
+    return (due_dt - date.today()).days
+
+
+# ----------------- Semantic Cache -----------------
+SEMANTIC_CACHE_THRESHOLD = 0.85
+_semantic_cache = deque(maxlen=1024)  # (embedding, date_bucket, reply)
+
+
+def _embed(text):
+    """Cheap local embedding: L2-normalized character-trigram counts."""
+    text = f"  {text}  "
+    grams = Counter(text[i:i + 3] for i in range(len(text) - 2))
+    norm = math.sqrt(sum(v * v for v in grams.values())) or 1.0
+    return {g: v / norm for g, v in grams.items()}
+
+
+def _cosine(a, b):
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(g, 0.0) for g, v in a.items())
+
+
+def _date_bucket(days_left):
+    """Map days-until-due onto the due-date rule buckets used in the prompt."""
+    if days_left is None:
+        return "none"
+    if days_left <= 2:
+        return "high"
+    if days_left <= 7:
+        return "medium"
+    return "later"
+
+
+def _semantic_lookup(embedding, bucket):
+    """Return a cached reply for a near-identical task in the same date bucket."""
+    best, best_sim = None, SEMANTIC_CACHE_THRESHOLD
+    for cached_emb, cached_bucket, reply in _semantic_cache:
+        if cached_bucket != bucket:
+            continue
+        sim = _cosine(embedding, cached_emb)
+        if sim >= best_sim:
+            best, best_sim = reply, sim
+    return best
 
 
 # ----------------- AI Functions -----------------
-def suggest_priority(title, description="", due_date=None):
+# Whole words (plus a plural s) only: this match skips the LLM, so "parent",
+# "current" or "example" must not count as "rent"/"exam"
+_PROMPT_URGENT_RE = re.compile(
+    r"\b(doctor|exam|surgery|rent|bill|deadline|project|meeting)s?\b", re.IGNORECASE
+)
+
+
+def _priority_key(title, description, due_date):
     """
-    Use OpenAI to suggest a priority level (High / Medium / Low)
-    based on task content and due date.
+    Cache key for suggest_priority: the normalized task text plus the due date
+    quantized to days-from-today, so the same relative-time prompt hits
+    regardless of the absolute date.
     """
-    today = datetime.today().strftime("%Y-%m-%d")
-    prompt = f"""
-You are an assistant that assigns task priorities: High, Medium, or Low.
+    ttl_bucket = int(time.time() // PRIORITY_CACHE_TTL)
+    return ("priority", _normalize(title), _normalize(description), _days_until(due_date), ttl_bucket)
+
 
-Today's date: {today}
-Task Title: {title}
-Description: {description}
-Due Date: {due_date}
+# Static instructions go in the system message so OpenAI's prompt-prefix
+# cache can hit across tasks; only the short user message varies.
+PRIORITY_SYSTEM_PROMPT = """
+You are an assistant that assigns task priorities: High, Medium, or Low.
 
 Rules:
 - If due date is within 2 days → High priority.
@@ -48,32 +209,192 @@ Priority: <High/Medium/Low>
 Reason: <short explanation>
 """
 
+
+def _priority_messages(key):
+    _, title, description, days_left, _ = key
+    today = date.today()
+    due_date = (today + timedelta(days=days_left)).isoformat() if days_left is not None else None
+    task = (
+        f"Task Title: {title}\n"
+        f"Description: {description}\n"
+        f"Due Date: {due_date}\n"
+        f"Today's date: {today.isoformat()}"
+    )
+    return [
+        {"role": "system", "content": PRIORITY_SYSTEM_PROMPT},
+        {"role": "user", "content": task},
+    ]
+
+
+def _cached_priority(key):
+    """
+    Return (reply, embedding). reply comes from the exact cache, or from the
+    semantic cache for a structurally similar task in the same due-date bucket.
+    """
+    reply = _cache_get(key)
+    if reply:
+        return reply, None
+    _, title, description, days_left, _ = key
+    embedding = _embed(f"{title} {description}")
+    reply = _semantic_lookup(embedding, _date_bucket(days_left))
+    if reply:
+        _cache_put(key, reply)
+    return reply, embedding
+
+
+def _remember_priority(key, embedding, reply):
+    _cache_put(key, reply)
+    _semantic_cache.append((embedding, _date_bucket(key[3]), reply))
+
+
+def _rule_priority(title, description, due_date):
+    """
+    Apply the prompt's deterministic rules locally. Returns a reply when they
+    settle the answer on their own (High, or Low for far-off tasks), and None
+    when the case is ambiguous enough to be worth asking the LLM.
+    """
+    days_left = _days_until(due_date)
+    if days_left is not None and days_left <= 2:
+        return "Priority: High\nReason: due in ≤2 days."
+    if _PROMPT_URGENT_RE.search(f"{title} {description}"):
+        return "Priority: High\nReason: contains an urgent keyword."
+    if days_left is not None and days_left > 7:
+        return "Priority: Low\nReason: due in more than 7 days with no urgent keywords."
+    return None
+
+
+def _fallback_priority(title, description, due_date):
+    """🔁 Smart local fallback (handles "tomorrow" correctly) — never cached."""
     try:
-        response = client.chat.completions.create(
-            model="gpt-5-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
+        today_dt = datetime.today()
+        if due_date:
+            due_dt = datetime.strptime(due_date, "%Y-%m-%d")
+            days_left = (due_dt - today_dt).days
+            if days_left <= 2:
+                return "Priority: High\nReason: due in ≤2 days (local fallback)."
+            elif days_left <= 7:
+                return "Priority: Medium\nReason: due in ≤7 days (local fallback)."
+        # keyword fallback
+        if _PROMPT_URGENT_RE.search(f"{title} {description}"):
+            return "Priority: High\nReason: urgent keyword (local fallback)."
+        return "Priority: Low\nReason: no urgency signals (local fallback)."
+    except Exception:
+        return "Priority: Medium\nReason: Default fallback (error during generation)."
+
+
+def suggest_priority(title, description="", due_date=None):
+    """
+    Use OpenAI to suggest a priority level (High / Medium / Low)
+    based on task content and due date.
+    Clear-cut cases are decided by the local rules without an API call.
+    """
+    ruled = _rule_priority(title, description, due_date)
+    if ruled:
+        return ruled
+
+    key = _priority_key(title, description, due_date)
+    reply, embedding = _cached_priority(key)
+    if reply:
+        return reply
+
+    try:
+        response = _complete(_priority_messages(key))
         reply = response.choices[0].message.content.strip()
+    except Exception:
+        return _fallback_priority(title, description, due_date)
+
+    _remember_priority(key, embedding, reply)
+    return reply
+
+
+async def suggest_priority_async(title, description="", due_date=None):
+    """Async twin of suggest_priority for the FastAPI routes (shares its caches)."""
+    ruled = _rule_priority(title, description, due_date)
+    if ruled:
+        return ruled
+
+    key = _priority_key(title, description, due_date)
+    reply, embedding = _cached_priority(key)
+    if reply:
         return reply
-    except Exception as e:
-        # 🔁 Smart local fallback (handles "tomorrow" correctly)
-        try:
-            today_dt = datetime.today()
-            if due_date:
-                due_dt = datetime.strptime(due_date, "%Y-%m-%d")
-                days_left = (due_dt - today_dt).days
-                if days_left <= 2:
-                    return "Priority: High\nReason: due in ≤2 days (local fallback)."
-                elif days_left <= 7:
-                    return "Priority: Medium\nReason: due in ≤7 days (local fallback)."
-            # keyword fallback
-            text = f"{title} {description}".lower()
-            if any(k in text for k in ["doctor", "exam", "surgery", "rent", "bill", "deadline", "project", "meeting"]):
-                return "Priority: High\nReason: urgent keyword (local fallback)."
-            return "Priority: Low\nReason: no urgency signals (local fallback)."
-        except Exception:
-            return "Priority: Medium\nReason: Default fallback (error during generation)."
+
+    try:
+        response = await _acomplete(_priority_messages(key))
+        reply = response.choices[0].message.content.strip()
+    except Exception:
+        return _fallback_priority(title, description, due_date)
+
+    _remember_priority(key, embedding, reply)
+    return reply
+
+
+async def suggest_priority_stream(title, description="", due_date=None):
+    """
+    Streaming twin of suggest_priority_async: yields the reply text as the model
+    produces it. Rule and cache hits are yielded whole; the finished stream is
+    cached like any other reply.
+    """
+    ruled = _rule_priority(title, description, due_date)
+    if ruled:
+        yield ruled
+        return
+
+    key = _priority_key(title, description, due_date)
+    reply, embedding = _cached_priority(key)
+    if reply:
+        yield reply
+        return
+
+    parts = []
+    try:
+        async for chunk in await _astream(_priority_messages(key)):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception:
+        if parts:
+            # Abort the response so the client sees a broken stream, not a short reply
+            raise
+        yield _fallback_priority(title, description, due_date)
+        return
+
+    reply = "".join(parts).strip()
+    if reply:
+        _remember_priority(key, embedding, reply)
+
+
+BULK_CONCURRENCY = 20
+ENRICH_CONCURRENCY = 10
+
+
+async def suggest_priority_bulk(items, concurrency=BULK_CONCURRENCY):
+    """
+    Suggest priorities for many tasks at once (e.g. a CSV import).
+    items: list of dicts with title / description / due_date.
+    Requests run concurrently, capped at `concurrency` in flight;
+    replies come back in input order.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with sem:
+            return await suggest_priority_async(
+                item.get("title", ""), item.get("description") or "", item.get("due_date")
+            )
+
+    return await asyncio.gather(*(one(item) for item in items))
+
+
+async def enrich_tasks_with_ai(tasks):
+    """
+    Attach a live AI priority ('ai_priority') to each task dict in place.
+    Fans out concurrently so wall time is ~one round-trip, not N.
+    """
+    replies = await suggest_priority_bulk(tasks, concurrency=ENRICH_CONCURRENCY)
+    for task, reply in zip(tasks, replies):
+        task["ai_priority"] = extract_priority(reply)
+    return tasks
 
 
 def extract_priority(ai_response):
@@ -88,14 +409,21 @@ def extract_priority(ai_response):
 
 
 # ----------------- Priority Evaluation -----------------
-def get_effective_priority(task):
+URGENT_KEYWORDS = frozenset({
+    "doctor", "appointment", "exam", "surgery", "meeting",
+    "interview", "deadline", "project", "bill", "payment"
+})
+# Whole words with an optional plural: "bills"/"meetings" count, "billiards" doesn't
+_URGENT_RE = re.compile(r"\b(" + "|".join(map(re.escape, sorted(URGENT_KEYWORDS))) + r")s?\b")
+
+
+def get_effective_priority(task, today=None):
     """
     Dynamically compute effective priority using due date, reminders, and keywords.
     Safe fallback if AI is unavailable.
+    Pass `today` when scoring many tasks so the clock is read once per batch.
     """
-    title = task.get("title", "").lower()
-    description = task.get("description", "").lower()
-    category = task.get("category", "").lower()
+    text = " ".join(task.get(k) or "" for k in ("title", "description", "category")).lower()
     due_date_str = task.get("due_date")
     reminder_days = task.get("reminder_days", 1)
 
@@ -105,7 +433,8 @@ def get_effective_priority(task):
     if due_date_str:
         due_date = safe_parse_date(due_date_str)
         if due_date:
-            today = datetime.now()
+            due_date = datetime.combine(due_date, datetime.min.time())
+            today = today or datetime.now()
             days_left = (due_date - today).days
 
             if days_left <= 2:
@@ -125,16 +454,11 @@ def get_effective_priority(task):
         else:
             reason.append("invalid or missing due date")
 
-    # Keyword check
-    urgent_keywords = [
-        "doctor", "appointment", "exam", "surgery", "meeting",
-        "interview", "deadline", "project", "bill", "payment"
-    ]
-    for kw in urgent_keywords:
-        if kw in title or kw in description or kw in category:
-            priority = "High"
-            reason.append(f"contains urgent keyword: {kw}")
-            break
+    # Keyword check — one compiled-regex search over the combined text
+    m = _URGENT_RE.search(text)
+    if m:
+        priority = "High"
+        reason.append(f"contains urgent keyword: {m.group(1)}")
 
     return {
         "priority": priority,
@@ -143,39 +467,67 @@ def get_effective_priority(task):
 
 
 # ----------------- Auto-Renew Prediction -----------------
-def predict_auto_renew(title, description=""):
-    """
-    Predict if a task repeats weekly and should auto-renew.
-    Returns 'Yes' or 'No'.
-    """
-    prompt = f"""
+# Words that make a weekly repeat plausible; callers pre-filter on these so
+# only candidate tasks reach the model
+AUTO_RENEW_KEYWORDS = (
+    "weekly", "daily", "every", "each", "monthly", "routine", "recurring",
+    "subscription", "rent", "bill", "laundry", "grocer", "trash", "garbage",
+    "recycling", "clean", "chore", "practice", "lesson", "class", "school",
+    "homework", "meeting", "standup", "gym", "workout", "church", "payment",
+)
+AUTO_RENEW_SYSTEM_PROMPT = """
 You are an assistant that determines if a task repeats weekly.
 If the task seems like a recurring household, work, or school task, reply 'Yes'.
 Otherwise reply 'No'.
 
-Task Title: {title}
-Description: {description}
-
 Answer with only 'Yes' or 'No'.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-5-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
-    except Exception:
-        # ✅ Fallback to gpt-4o-mini if gpt-5-mini not available
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
 
+def _auto_renew_messages(title, description):
+    return [
+        {"role": "system", "content": AUTO_RENEW_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Task Title: {title}\nDescription: {description}"},
+    ]
+
+
+def _parse_auto_renew(response):
+    reply = response.choices[0].message.content.strip().lower()
+    return "Yes" if "yes" in reply else "No"
+
+
+def predict_auto_renew(title, description=""):
+    """
+    Predict if a task repeats weekly and should auto-renew.
+    Returns 'Yes' or 'No'.
+    """
+    key = ("auto_renew", _normalize(title), _normalize(description))
+    cached = _cache_get(key)
+    if cached:
+        return cached
+
+    messages = _auto_renew_messages(key[1], key[2])
     try:
-        reply = response.choices[0].message.content.strip().lower()
-        return "Yes" if "yes" in reply else "No"
+        answer = _parse_auto_renew(_complete(messages))
     except Exception as e:
         print(f"⚠️ Auto-renew AI check failed: {e}")
         return "No"
+
+    _cache_put(key, answer)
+    return answer
+
+
+def predict_auto_renew_batch(pairs, concurrency=BULK_CONCURRENCY):
+    """
+    Classify many (title, description) pairs at once; returns 'Yes'/'No' per pair.
+    Duplicate pairs are asked once, and cache misses run on a bounded thread pool
+    (sync, so it is safe to call from worker threads and the CLI alike).
+    """
+    keys = [(_normalize(t), _normalize(d)) for t, d in pairs]
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return []
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique))) as pool:
+        answers = dict(zip(unique, pool.map(lambda k: predict_auto_renew(*k), unique)))
+    return [answers[k] for k in keys]
+
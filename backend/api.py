@@ -1,21 +1,23 @@
 # backend/api.py
 from fastapi import FastAPI, HTTPException, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
-import sqlite3, pandas as pd, os
-from datetime import datetime
-from openai import OpenAI
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+import os, time, hashlib
+from collections import OrderedDict
 
 from backend.task_manager import (
-    add_task, update_task, mark_task_complete,
-    delete_task, get_recurring_suggestions,
-    get_summary_stats, init_db, DB_PATH
+    add_task, add_tasks_bulk, update_task, update_tasks, mark_task_complete,
+    delete_task, ALLOWED_UPDATE_FIELDS, get_recurring_suggestions,
+    get_summary_stats, init_db, get_conn, close_all_conns
+)
+from backend import db_pool
+from backend.ai_agent import (
+    _acomplete, suggest_priority_async, suggest_priority_bulk, suggest_priority_stream,
+    enrich_tasks_with_ai, extract_priority
 )
-from backend.ai_agent import suggest_priority, extract_priority, predict_auto_renew
-
-# Initialize OpenAI
-client = OpenAI()
 
 # =====================================================
 # 🚀 Initialize FastAPI App
@@ -30,15 +32,24 @@ app.add_middleware(
 )
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     init_db()
     init_user_db()
+    await db_pool.init_pool()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await db_pool.close_pool()
+    close_all_conns()
 
 
 # =====================================================
 # 📋 Data Models
 # =====================================================
 class Task(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
     title: str
     description: Optional[str] = ""
     category: Optional[str] = ""
@@ -52,6 +63,23 @@ class User(BaseModel):
     email: str
 
 
+class TaskOut(BaseModel):
+    task_id: int
+    title: str
+    description: Optional[str] = None
+    category: Optional[str] = None
+    due_date: Optional[str] = None
+    priority: Optional[str] = None
+    reminder_days: Optional[int] = None
+    status: Optional[str] = None
+    ai_priority: Optional[str] = None  # only with ?enrich=1
+
+
+class TaskPage(BaseModel):
+    tasks: List[TaskOut]
+    next_cursor: Optional[str] = None
+
+
 # =====================================================
 # 🧑‍💻 Auth (very simple email-based)
 # =====================================================
@@ -60,37 +88,38 @@ USERS_DB = "database/users.db"
 def init_user_db():
     """Create users table if not exists"""
     os.makedirs("database", exist_ok=True)
-    with sqlite3.connect(USERS_DB) as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                email TEXT PRIMARY KEY,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
+    get_conn(USERS_DB).execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            email TEXT PRIMARY KEY,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _insert_user(email):
+    # Autocommit connection: the single INSERT OR IGNORE is its own transaction
+    get_conn(USERS_DB).execute("INSERT OR IGNORE INTO users (email) VALUES (?)", (email,))
+
+
+def _find_user(email):
+    return get_conn(USERS_DB).execute("SELECT email FROM users WHERE email=?", (email,)).fetchone()
 
 
 @app.post("/auth/register")
-def register_user(user: User):
+async def register_user(user: User):
     """Register a new user by email."""
     try:
-        with sqlite3.connect(USERS_DB) as conn:
-            c = conn.cursor()
-            c.execute("INSERT OR IGNORE INTO users (email) VALUES (?)", (user.email,))
-            conn.commit()
+        await run_in_threadpool(_insert_user, user.email)
         return {"message": f"✅ Registered {user.email} successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/auth/login")
-def login_user(user: User):
+async def login_user(user: User):
     """Login endpoint — simply validates user exists."""
     try:
-        with sqlite3.connect(USERS_DB) as conn:
-            c = conn.cursor()
-            c.execute("SELECT email FROM users WHERE email=?", (user.email,))
-            found = c.fetchone()
+        found = await run_in_threadpool(_find_user, user.email)
         if found:
             return {"access_token": user.email, "message": "Login successful"}
         else:
@@ -113,46 +142,108 @@ def get_user_email(x_user_email: str = Header(...)):
 # ➕ Create Task
 # =====================================================
 @app.post("/tasks")
-def create_task(task: Task, user_email: str = Depends(get_user_email)):
+async def create_task(task: Task, user_email: str = Depends(get_user_email)):
     try:
-        add_task(user_email=user_email, **task.dict())
+        await run_in_threadpool(add_task, user_email=user_email, **task.model_dump(exclude_unset=True))
         return {"message": f"Task '{task.title}' added for {user_email}!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# =====================================================
+# 📥 Batch Create / Update
+# =====================================================
+# Declared before the /tasks/{task_id} routes so "batch" isn't parsed as an id
+@app.post("/tasks/batch")
+async def create_tasks_batch(tasks: List[Task], user_email: str = Depends(get_user_email)):
+    """Insert many tasks in one request and one transaction."""
+    try:
+        await run_in_threadpool(add_tasks_bulk, user_email, [t.model_dump(exclude_unset=True) for t in tasks])
+        return {"message": f"✅ {len(tasks)} task(s) added for {user_email}"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.patch("/tasks/batch")
+async def update_tasks_batch(updates: List[dict], user_email: str = Depends(get_user_email)):
+    """
+    Apply [{"task_id": ..., <fields>}, ...] in one transaction (all or nothing).
+    {"task_id": ..., "delete": true} entries delete the task in the same batch.
+    """
+    try:
+        await run_in_threadpool(update_tasks, user_email, updates)
+        return {"message": f"✅ {len(updates)} task(s) updated for {user_email}"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =====================================================
 # 📦 Get Tasks (Calendar Display)
 # =====================================================
-@app.get("/tasks")
-def get_tasks(user_email: str = Depends(get_user_email)):
-    """Fetch tasks belonging to a single user (for calendar display)."""
+TASKS_PAGE_SIZE = 100
+TASKS_MAX_PAGE_SIZE = 500
+
+
+# Constant SQL text so each pooled connection's statement cache hits.
+# Ordered by due date like the original /tasks (undated first, as SQLite sorts
+# NULL), with task_id breaking ties so the (due_date, task_id) keyset is unique.
+TASKS_PAGE_QUERY = """
+    SELECT task_id, title, description, category, due_date,
+           priority, reminder_days, status
+    FROM tasks
+    WHERE user_email=? AND (COALESCE(due_date, ''), task_id) > (?, ?)
+    ORDER BY COALESCE(due_date, ''), task_id
+    LIMIT ?
+"""
+
+
+def _encode_cursor(task):
+    return f"{task['due_date'] or ''}~{task['task_id']}"
+
+
+def _decode_cursor(cursor):
+    """'<due_date>~<task_id>' -> (due_date, task_id); ('', 0) starts from the top."""
+    if not cursor:
+        return "", 0
+    due_date, sep, task_id = cursor.rpartition("~")
+    if not sep or not task_id.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return due_date, int(task_id)
+
+
+async def _fetch_tasks(user_email, limit, after):
+    """One keyset page: the tasks after `after` in (due_date, task_id) order."""
+    async with db_pool.connection() as conn:
+        rows = await conn.execute_fetchall(TASKS_PAGE_QUERY, (user_email, *after, limit))
+
+    return [dict(r) for r in rows]
+
+
+# exclude_unset: ai_priority is omitted unless ?enrich=1 filled it in
+@app.get("/tasks", response_model_exclude_unset=True)
+async def get_tasks(
+    limit: int = TASKS_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    enrich: bool = False,
+    user_email: str = Depends(get_user_email),
+) -> TaskPage:
+    """
+    Fetch tasks belonging to a single user (for calendar display), ordered by due date.
+    Keyset-paginated, at most `limit` tasks per page: pass the returned
+    `next_cursor` as ?cursor= to get the next page (null when there are no more).
+    Pass ?enrich=1 to add a live AI-recomputed 'ai_priority' to each task.
+    """
+    after = _decode_cursor(cursor)
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute("""
-                SELECT task_id, title, description, category, due_date,
-                       priority, reminder_days, status
-                FROM tasks
-                WHERE user_email=?
-                ORDER BY due_date
-            """, (user_email,))
-            rows = c.fetchall()
-
-        tasks = [
-            {
-                "task_id": r[0],
-                "title": r[1],
-                "description": r[2],
-                "category": r[3],
-                "due_date": r[4],
-                "priority": r[5],
-                "reminder_days": r[6],
-                "status": r[7]
-            }
-            for r in rows
-        ]
-        return {"tasks": tasks}
+        limit = max(1, min(limit, TASKS_MAX_PAGE_SIZE))
+        tasks = await _fetch_tasks(user_email, limit, after)
+        if enrich:
+            await enrich_tasks_with_ai(tasks)
+        next_cursor = _encode_cursor(tasks[-1]) if len(tasks) == limit else None
+        # Typed return: FastAPI serializes straight to JSON bytes via pydantic
+        return {"tasks": tasks, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB Error: {e}")
 
@@ -161,10 +252,17 @@ def get_tasks(user_email: str = Depends(get_user_email)):
 # ✏️ Update Task
 # =====================================================
 @app.patch("/tasks/{task_id}")
-def update_task_api(task_id: int, updates: dict, user_email: str = Depends(get_user_email)):
+async def update_task_api(task_id: int, updates: dict, user_email: str = Depends(get_user_email)):
+    # Checked before the **updates splat: a "user_email" or "task_id" key would
+    # otherwise collide with update_task's own parameters
+    bad = updates.keys() - ALLOWED_UPDATE_FIELDS
+    if bad:
+        raise HTTPException(status_code=400, detail=f"Cannot update field(s): {', '.join(sorted(bad))}")
     try:
-        update_task(user_email, task_id, **updates)
+        await run_in_threadpool(update_task, user_email, task_id, **updates)
         return {"message": f"✅ Task {task_id} updated for {user_email}"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -173,9 +271,9 @@ def update_task_api(task_id: int, updates: dict, user_email: str = Depends(get_u
 # 🗑️ Delete Task
 # =====================================================
 @app.delete("/tasks/{task_id}")
-def delete_task_api(task_id: int, user_email: str = Depends(get_user_email)):
+async def delete_task_api(task_id: int, user_email: str = Depends(get_user_email)):
     try:
-        delete_task(user_email, task_id)
+        await run_in_threadpool(delete_task, user_email, task_id)
         return {"message": f"🗑️ Task {task_id} deleted for {user_email}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -185,9 +283,9 @@ def delete_task_api(task_id: int, user_email: str = Depends(get_user_email)):
 # ✅ Complete Task
 # =====================================================
 @app.post("/tasks/{task_id}/complete")
-def complete_task(task_id: int, user_email: str = Depends(get_user_email)):
+async def complete_task(task_id: int, user_email: str = Depends(get_user_email)):
     try:
-        mark_task_complete(user_email, task_id)
+        await run_in_threadpool(mark_task_complete, user_email, task_id)
         return {"message": f"✅ Task {task_id} marked completed for {user_email}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -197,21 +295,44 @@ def complete_task(task_id: int, user_email: str = Depends(get_user_email)):
 # 🤖 AI Priority Suggestion
 # =====================================================
 @app.post("/ai/priority")
-def ai_priority(task: Task):
+async def ai_priority(task: Task):
     try:
-        response = suggest_priority(task.title, task.description, task.due_date)
+        response = await suggest_priority_async(task.title, task.description, task.due_date)
         return {"ai_response": response, "priority": extract_priority(response)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/ai/priority/stream")
+async def ai_priority_stream(task: Task):
+    """Same reply as /ai/priority, streamed as plain text while the model writes it."""
+    return StreamingResponse(
+        suggest_priority_stream(task.title, task.description, task.due_date),
+        media_type="text/plain; charset=utf-8",
+    )
+
+
+@app.post("/ai/priority/bulk")
+async def ai_priority_bulk(tasks: List[Task]):
+    """Suggest priorities for a batch of tasks (import path)."""
+    try:
+        responses = await suggest_priority_bulk([t.model_dump() for t in tasks])
+        return {
+            "results": [
+                {"ai_response": r, "priority": extract_priority(r)} for r in responses
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =====================================================
 # 🔁 AI Recurring Suggestion
 # =====================================================
 @app.get("/ai/suggestions")
-def ai_recurring(user_email: str = Depends(get_user_email)):
+async def ai_recurring(user_email: str = Depends(get_user_email)):
     try:
-        suggestions = get_recurring_suggestions(user_email)
+        suggestions = await run_in_threadpool(get_recurring_suggestions, user_email)
         return {"suggestions": suggestions}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -220,11 +341,31 @@ def ai_recurring(user_email: str = Depends(get_user_email)):
 # =====================================================
 # 🧠 AI Summary
 # =====================================================
+SUMMARY_CACHE_TTL = 300  # seconds
+SUMMARY_CACHE_SIZE = 64
+_summary_cache = OrderedDict()  # (stats fingerprint, ttl bucket) -> summary
+
+
+def _stats_fingerprint(stats):
+    """Cheap fingerprint of everything the summary prompt is built from."""
+    return hashlib.md5(repr(sorted(stats.items())).encode()).hexdigest()
+
+
 @app.get("/ai/summary")
-def ai_summary(user_email: str = Depends(get_user_email)):
-    """Generate a natural-language summary and structured stats for one user."""
+async def ai_summary(user_email: str = Depends(get_user_email)):
+    """
+    Generate a natural-language summary and structured stats for one user.
+    Identical stats give an identical prompt, so the LLM summary is cached by
+    a fingerprint of the stats (refreshed at least every SUMMARY_CACHE_TTL
+    seconds); any write that changes the stats simply misses.
+    """
     try:
-        stats = get_summary_stats(user_email)
+        stats = await run_in_threadpool(get_summary_stats, user_email)
+
+        key = (_stats_fingerprint(stats), int(time.time() // SUMMARY_CACHE_TTL))
+        if key in _summary_cache:
+            _summary_cache.move_to_end(key)
+            return {"summary": _summary_cache[key], "stats": stats}
 
         prompt = f"""
 You are a warm productivity coach summarizing this user's family tasks.
@@ -232,18 +373,20 @@ You are a warm productivity coach summarizing this user's family tasks.
 Stats:
 Total: {stats['total']}, Completed: {stats['completed']}, Overdue: {stats['overdue']}.
 Categories: {stats['categories']}
+Upcoming high-priority tasks: {stats['upcoming_high']}
 
 Write a friendly, encouraging 3–5 sentence summary that:
-- Mentions progress and overdue items
+- Mentions progress, overdue items and the next high-priority tasks
 - Highlights strong categories
 - Ends with motivation.
 """
 
-        response = client.chat.completions.create(
-            model="gpt-5-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        # Same model selection (and 404 fallback) as every other AI route
+        response = await _acomplete([{"role": "user", "content": prompt}])
         summary = response.choices[0].message.content.strip()
+        _summary_cache[key] = summary
+        if len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
 
         return {"summary": summary, "stats": stats}
     except Exception as e:
@@ -254,5 +397,5 @@ Write a friendly, encouraging 3–5 sentence summary that:
 # 🧩 Root
 # =====================================================
 @app.get("/")
-def root():
+async def root():
     return {"message": "✅ Family Calendar AI API v2 running successfully!"}
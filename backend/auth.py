@@ -4,67 +4,86 @@ from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, EmailStr
 from passlib.context import CryptContext
 from jose import jwt, JWTError
-import os, sqlite3
-from .task_manager import DB_PATH, init_db
+import asyncio, os, threading, time
+from collections import OrderedDict
+from .task_manager import get_conn, transaction
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 SECRET_KEY = os.getenv("SECRET_KEY", "change_me_in_env")
 ALGORITHM = "HS256"
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost factor is tunable; family-scale deployments can trade some cost for latency
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 class Credentials(BaseModel):
     email: EmailStr
     password: str
 
-def _get_conn():
-    return sqlite3.connect(DB_PATH)
-
-def _ensure_users_table():
-    with _get_conn() as conn:
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS users(
-          user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-          email TEXT UNIQUE NOT NULL,
-          password_hash TEXT NOT NULL
-        );
-        """)
-        conn.commit()
-
-@router.post("/register")
-def register(creds: Credentials):
-    _ensure_users_table()
-    with _get_conn() as conn:
+def _insert_user(email, password_hash):
+    conn = get_conn()
+    with transaction(conn):
         cur = conn.cursor()
-        cur.execute("SELECT 1 FROM users WHERE email=?", (creds.email,))
+        cur.execute("SELECT 1 FROM users WHERE email=?", (email,))
         if cur.fetchone():
             raise HTTPException(400, "User already exists")
         cur.execute(
             "INSERT INTO users(email, password_hash) VALUES(?,?)",
-            (creds.email, pwd_ctx.hash(creds.password)),
+            (email, password_hash),
         )
-        conn.commit()
+
+def _password_hash(email):
+    row = get_conn().execute(
+        "SELECT password_hash FROM users WHERE email=?", (email,)
+    ).fetchone()
+    return row[0] if row else None
+
+# bcrypt and sqlite calls run in worker threads so the event loop stays free
+@router.post("/register")
+async def register(creds: Credentials):
+    hashed = await asyncio.to_thread(pwd_ctx.hash, creds.password)
+    await asyncio.to_thread(_insert_user, creds.email, hashed)
     return {"message": "Registered successfully."}
 
 @router.post("/login")
-def login(creds: Credentials):
-    _ensure_users_table()
-    with _get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT password_hash FROM users WHERE email=?", (creds.email,))
-        row = cur.fetchone()
-        if not row or not pwd_ctx.verify(creds.password, row[0]):
-            raise HTTPException(401, "Invalid email or password")
+async def login(creds: Credentials):
+    stored = await asyncio.to_thread(_password_hash, creds.email)
+    if not stored or not await asyncio.to_thread(pwd_ctx.verify, creds.password, stored):
+        raise HTTPException(401, "Invalid email or password")
     token = jwt.encode({"sub": creds.email}, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": token, "token_type": "bearer"}
 
+# Recently verified tokens, so repeat requests skip jwt.decode for a short window
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_SIZE = 10_000
+_token_cache = OrderedDict()  # token -> (email, expires_at)
+_token_lock = threading.Lock()
+
 def get_current_user_email(token: str = Depends(oauth2_scheme)) -> str:
+    now = time.monotonic()
+    with _token_lock:
+        hit = _token_cache.get(token)
+        if hit and hit[1] <= now:
+            del _token_cache[token]
+            hit = None
+    if hit:
+        return hit[0]
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
         if not email:
             raise HTTPException(401, "Invalid token")
+        # Never cache past the token's own expiry (exp is wall-clock, the cache monotonic)
+        expires_at = now + TOKEN_CACHE_TTL
+        if "exp" in payload:
+            expires_at = min(expires_at, now + (float(payload["exp"]) - time.time()))
+        if expires_at > now:
+            with _token_lock:
+                _token_cache[token] = (email, expires_at)
+                _token_cache.move_to_end(token)
+                if len(_token_cache) > TOKEN_CACHE_SIZE:
+                    _token_cache.popitem(last=False)
         return email
     except JWTError:
         raise HTTPException(401, "Invalid or expired token")
@@ -1,7 +1,7 @@
 from backend.task_manager import (
-    add_task, view_tasks, mark_task_complete,
+    add_task, add_tasks_bulk, view_tasks, mark_task_complete,
     update_task, delete_task, clear_all_tasks, get_recurring_suggestions,
-    init_db, safe_parse_date
+    send_due_reminders, init_db, safe_parse_date
 )
 from backend.ai_agent import suggest_priority, extract_priority
 
@@ -20,6 +20,7 @@ def main():
         print("4. Update Task")
         print("5. Delete Task")
         print("6. Clear All Tasks")
+        print("7. Send Due Reminders")
         print("0. Exit")
 
         choice = input("\nChoose an option: ").strip()
@@ -40,7 +41,7 @@ def main():
                 if not parsed_date:
                     print("⚠️ Invalid date format. Use YYYY-MM-DD (e.g., 2025-10-13).")
                     continue
-                due_date = parsed_date.strftime("%Y-%m-%d")
+                due_date = parsed_date.isoformat()
 
             reminder_days = input("Reminder Days (default 1): ").strip() or "1"
             try:
@@ -73,20 +74,15 @@ def main():
             view_tasks(sort_by=sort_by, user_email=user_email)
 
             auto_add = input("\nDo you want to auto-add AI-predicted recurring tasks? (y/n): ").strip().lower()
-            if auto_add == "y":
-                suggestions = get_recurring_suggestions()
+            if auto_add == "y" and not user_email:
+                # Tasks are stored per user; there is no one to add them for
+                print("⚠️ Auto-add needs an email. Restart the CLI and enter one to use it.")
+            elif auto_add == "y":
+                suggestions = get_recurring_suggestions(user_email)
                 if not suggestions:
                     print("📭 No recurring tasks detected.")
                 else:
-                    for task in suggestions:
-                        add_task(
-                            task['title'],
-                            task['description'],
-                            task['category'],
-                            task['due_date'],
-                            priority=task['priority'],
-                            reminder_days=task['reminder_days']
-                        )
+                    add_tasks_bulk(user_email, suggestions)
                     print(f"✅ {len(suggestions)} recurring tasks auto-added.")
 
         # ----------------- MARK COMPLETE -----------------
@@ -128,6 +124,14 @@ def main():
             else:
                 print("❌ Operation cancelled.")
 
+        # ----------------- REMINDERS -----------------
+        elif choice == "7":
+            if not user_email:
+                print("⚠️ Reminders need an email. Restart the CLI and enter one to use it.")
+            else:
+                sent = send_due_reminders(user_email)
+                print(f"📧 {sent} reminder(s) sent.")
+
         # ----------------- EXIT -----------------
         elif choice == "0":
             print("👋 Goodbye! Stay productive!")
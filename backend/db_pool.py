@@ -0,0 +1,56 @@
+# backend/db_pool.py
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+from backend import task_manager
+
+# =====================================================
+# 🔌 ASYNC CONNECTION POOL (aiosqlite, for async routes)
+# =====================================================
+POOL_SIZE = 4
+
+_pool = None
+
+
+async def init_pool(size=POOL_SIZE, path=None):
+    """Open `size` WAL-mode aiosqlite connections and park them in a queue."""
+    global _pool
+    _pool = asyncio.Queue(maxsize=size)
+    for _ in range(size):
+        conn = await aiosqlite.connect(path or task_manager.DB_PATH)
+        for pragma in task_manager.PRAGMAS:
+            await conn.execute(pragma)
+        conn.row_factory = aiosqlite.Row
+        _pool.put_nowait(conn)
+
+
+async def close_pool():
+    """Close every pooled connection (called on app shutdown)."""
+    global _pool
+    if _pool is None:
+        return
+    while not _pool.empty():
+        conn = _pool.get_nowait()
+        await conn.close()
+    _pool = None
+
+
+async def acquire():
+    """Wait for a free connection; the pool bounds DB concurrency."""
+    return await _pool.get()
+
+
+def release(conn):
+    _pool.put_nowait(conn)
+
+
+@asynccontextmanager
+async def connection():
+    """`async with connection() as conn:` — acquire, then always release."""
+    conn = await acquire()
+    try:
+        yield conn
+    finally:
+        release(conn)
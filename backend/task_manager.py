@@ -1,90 +1,398 @@
 # backend/task_manager.py
+import asyncio
+import functools
+import itertools
+import json
+import time
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
 import os, smtplib
 from email.message import EmailMessage
-from backend.ai_agent import predict_auto_renew
+import numpy as np
+from colorama import Fore, Style
+from tabulate import tabulate
+from backend.ai_agent import AUTO_RENEW_KEYWORDS, predict_auto_renew_batch, safe_parse_date
 
 # =====================================================
 # 📂 DATABASE PATH
 # =====================================================
 DB_PATH = "database/family_calendar.db"
 
-# ----------------- Helper: Safe Date Parsing -----------------
-def safe_parse_date(date_str):
-    """Safely parse a date string (YYYY-MM-DD)."""
+
+# =====================================================
+# 🔌 CONNECTION POOL (one long-lived connection per thread)
+# =====================================================
+_conn_local = threading.local()
+_all_conns = []
+_all_conns_lock = threading.Lock()
+_pool_generation = 0  # bumped by close_all_conns so other threads drop stale handles
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",     # ~64 MB page cache
+    "PRAGMA mmap_size=268435456",   # 256 MB memory-mapped I/O
+)
+
+
+def get_conn(path=None):
+    """
+    Return this thread's pooled connection to `path` (defaults to DB_PATH),
+    opening and configuring it on first use. Connections run in autocommit
+    mode; multi-statement writes wrap themselves in `transaction()`.
+    """
+    path = path or DB_PATH
+    conns = getattr(_conn_local, "conns", None)
+    if conns is None or _conn_local.generation != _pool_generation:
+        conns = _conn_local.conns = {}
+        _conn_local.generation = _pool_generation
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conn.row_factory = sqlite3.Row
+        conns[path] = conn
+        with _all_conns_lock:
+            _all_conns.append(conn)
+    return conn
+
+
+# Bumped after every committed write; read-side caches key on it
+_write_counter = itertools.count(1)
+_write_version = 0
+
+
+@contextmanager
+def transaction(conn):
+    """Explicit BEGIN IMMEDIATE / COMMIT, rolling back on error."""
+    global _write_version
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
-    except (ValueError, TypeError):
-        return None
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    _write_version = next(_write_counter)
+
+
+def close_all_conns():
+    """Close every pooled connection (called on app shutdown)."""
+    global _pool_generation
+    with _all_conns_lock:
+        _pool_generation += 1
+        while _all_conns:
+            _all_conns.pop().close()
+    _conn_local.__dict__.clear()
+
+# UPDATE/DELETE ... RETURNING fuses the write and the ownership check (SQLite 3.35+)
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+
+@functools.lru_cache(maxsize=None)
+def _returning(query):
+    return query + " RETURNING task_id"
+
+
+def _execute_owned(conn, query, params):
+    """Run a user-scoped UPDATE/DELETE; raise if it touched no row."""
+    if HAS_RETURNING:
+        found = bool(conn.execute(_returning(query), params).fetchall())
+    else:
+        found = conn.execute(query, params).rowcount > 0
+    if not found:
+        raise ValueError("Task not found or not owned by user.")
+
+
+# Stored alongside `priority` so sorts use an index instead of CASE/collation
+PRIORITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
+
+def normalize_priority(priority):
+    """Canonical 'Low'/'Medium'/'High' label, applied at write time so reads can trust it."""
+    label = (priority or "Medium").strip().title()
+    return label if label.lower() in PRIORITY_RANK else "Medium"
+
+
+def normalize_status(status):
+    """Canonical title-cased status ('Pending', 'Completed', ...) so SQL can compare with '='."""
+    return (status or "Pending").strip().title()
+
+
+def priority_rank(priority):
+    """Numeric sort key for a priority label (unknown labels rank 0)."""
+    return PRIORITY_RANK.get((priority or "").strip().lower(), 0)
+
+
+# Stored alongside `status`: integer compares for the open/done split in scans
+STATUS_OPEN, STATUS_COMPLETED = 0, 1
+
+
+def status_code(status):
+    """1 for a completed task, 0 for anything still open."""
+    return STATUS_COMPLETED if normalize_status(status) == "Completed" else STATUS_OPEN
 
 
 # =====================================================
 # 🧱 INITIALIZE DATABASE
 # =====================================================
+def _migrate_create_tasks(c):
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            due_date TEXT,
+            duration REAL,
+            priority TEXT DEFAULT 'Medium' CHECK (priority IN ('Low', 'Medium', 'High')),
+            reminder_days INTEGER DEFAULT 1,
+            status TEXT DEFAULT 'Pending',
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            recurring_rule TEXT,
+            tags TEXT,
+            user_email TEXT NOT NULL
+        )
+    """)
+    # Pre-account databases (like the original database/family_calendar.db) have a
+    # tasks table without user_email; every later step and query is scoped by it.
+    # Their rows belong to nobody until claimed, so they get an empty owner.
+    columns = {r[1] for r in c.execute("PRAGMA table_info(tasks)")}
+    if "user_email" not in columns:
+        c.execute("ALTER TABLE tasks ADD COLUMN user_email TEXT NOT NULL DEFAULT ''")
+
+
+def _migrate_priority_rank(c):
+    # Checked rather than assumed: databases from before versioning may already have it
+    columns = {r[1] for r in c.execute("PRAGMA table_info(tasks)")}
+    if "priority_rank" not in columns:
+        c.execute("ALTER TABLE tasks ADD COLUMN priority_rank INTEGER DEFAULT 2")
+    c.execute("""
+        UPDATE tasks SET priority_rank = CASE LOWER(priority)
+            WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 ELSE 0 END
+    """)
+
+
+def _migrate_indexes(c):
+    # Every query is scoped by user_email, so the bare due_date index is dead weight
+    c.execute("DROP INDEX IF EXISTS idx_due_date")
+    # Per-user lookups by due date and summary stats
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_due ON tasks(user_email, due_date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_status ON tasks(user_email, status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_priority ON tasks(user_email, priority_rank DESC, due_date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_category ON tasks(user_email, category)")
+
+
+def _migrate_status_case(c):
+    # Statuses are title-cased at write time; fix up rows written before that
+    c.execute("""
+        UPDATE tasks SET status = CASE LOWER(TRIM(status))
+            WHEN 'completed' THEN 'Completed' ELSE 'Pending' END
+        WHERE status IS NULL OR LOWER(TRIM(status)) IN ('completed', 'pending', '')
+    """)
+
+
+def _migrate_status_code(c):
+    columns = {r[1] for r in c.execute("PRAGMA table_info(tasks)")}
+    if "status_code" not in columns:
+        c.execute("ALTER TABLE tasks ADD COLUMN status_code INTEGER NOT NULL DEFAULT 0 CHECK (status_code IN (0, 1))")
+    c.execute("UPDATE tasks SET status_code = (status = 'Completed')")
+    c.execute("DROP INDEX IF EXISTS idx_tasks_user_status")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_status_code ON tasks(user_email, status_code)")
+
+
+def _migrate_summary_indexes(c):
+    # Covering index for SQL_SUMMARY: the GROUP BY never touches table rows
+    c.execute("DROP INDEX IF EXISTS idx_tasks_user_category")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_summary ON tasks(user_email, category, status_code, due_date)")
+    c.execute("DROP INDEX IF EXISTS idx_tasks_user_status_code")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_status_due ON tasks(user_email, status_code, due_date)")
+    # Partial index holding only open high-priority tasks (SQL_UPCOMING_HIGH)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_open_high ON tasks(user_email, due_date)
+        WHERE priority_rank = 3 AND status_code = 0
+    """)
+
+
+def _migrate_users(c):
+    # Password accounts for backend.auth; created here so auth calls skip the DDL
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL
+        )
+    """)
+
+
+def _migrate_tasks_page_index(c):
+    # /tasks keyset pages on (COALESCE(due_date, ''), task_id); matches the expression exactly
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_page
+        ON tasks(user_email, COALESCE(due_date, ''), task_id)
+    """)
+
+
+# Schema history; PRAGMA user_version records how many have been applied.
+# Append new steps, never edit or reorder old ones.
+MIGRATIONS = [
+    _migrate_create_tasks,
+    _migrate_priority_rank,
+    _migrate_indexes,
+    _migrate_users,
+    _migrate_status_case,
+    _migrate_status_code,
+    _migrate_summary_indexes,
+    _migrate_tasks_page_index,
+]
+
+
 def init_db():
-    """Create database and table if they don’t exist."""
+    """Bring the database schema up to date (a single PRAGMA read when current)."""
     os.makedirs("database", exist_ok=True)
-    with sqlite3.connect(DB_PATH) as conn:
+    conn = get_conn()
+    with transaction(conn):
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        if version >= len(MIGRATIONS):
+            return
         c = conn.cursor()
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                due_date TEXT,
-                duration REAL,
-                priority TEXT DEFAULT 'Medium',
-                reminder_days INTEGER DEFAULT 1,
-                status TEXT DEFAULT 'Pending',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                recurring_rule TEXT,
-                tags TEXT,
-                user_email TEXT NOT NULL
-            )
-        """)
-        c.execute("CREATE INDEX IF NOT EXISTS idx_due_date ON tasks(due_date)")
-        conn.commit()
-    print("✅ Database initialized successfully.")
+        for migrate in MIGRATIONS[version:]:
+            migrate(c)
+        conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+    # Refresh planner statistics so the composite indexes get picked
+    conn.execute("ANALYZE")
+    print(f"✅ Database migrated to schema v{len(MIGRATIONS)}.")
 
 
 # =====================================================
 # ➕ ADD TASK
 # =====================================================
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (title, description, category, due_date, duration,
+                       priority, priority_rank, reminder_days, status,
+                       status_code, recurring_rule, tags, user_email)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def add_task(user_email, title, description="", category="", due_date=None,
              duration=None, priority="Medium", reminder_days=1,
              status="Pending", recurring_rule=None, tags=None):
     """Add a new task to the database for a specific user."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("""
-            INSERT INTO tasks (title, description, category, due_date, duration,
-                               priority, reminder_days, status,
-                               recurring_rule, tags, user_email)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (title, description, category, due_date, duration, priority,
-              reminder_days, status, recurring_rule, tags, user_email))
-        conn.commit()
+    add_tasks_bulk(user_email, [{
+        "title": title, "description": description, "category": category,
+        "due_date": due_date, "duration": duration, "priority": priority,
+        "reminder_days": reminder_days, "status": status,
+        "recurring_rule": recurring_rule, "tags": tags,
+    }])
+
+
+def add_tasks_bulk(user_email, tasks):
+    """Insert many tasks for one user in a single transaction (executemany)."""
+    rows = []
+    for t in tasks:
+        priority = normalize_priority(t.get("priority"))
+        status = normalize_status(t.get("status"))
+        rows.append((t["title"], t.get("description", ""), t.get("category", ""), t.get("due_date"),
+                     t.get("duration"), priority, priority_rank(priority),
+                     t.get("reminder_days", 1), status, status_code(status), t.get("recurring_rule"),
+                     t.get("tags"), user_email))
+    if not rows:
+        return
+    conn = get_conn()
+    with transaction(conn):
+        conn.executemany(SQL_INSERT_TASK, rows)
 
 
 # =====================================================
 # ✏️ UPDATE TASK
 # =====================================================
+# Columns callers may set; priority_rank/status_code are derived, never passed in
+ALLOWED_UPDATE_FIELDS = frozenset({
+    "title", "description", "category", "due_date", "duration", "priority",
+    "reminder_days", "status", "recurring_rule", "tags",
+})
+
+
+@functools.lru_cache(maxsize=128)
+def _update_sql(field_key, bulk=False):
+    """UPDATE statement for one (sorted) combination of columns."""
+    fields = ", ".join(f"{k}=?" for k in field_key)
+    # Bulk form binds the ids as one JSON array, so its text doesn't vary with the count
+    target = "task_id IN (SELECT value FROM json_each(?))" if bulk else "task_id=?"
+    return f"UPDATE tasks SET {fields}, updated_at=CURRENT_TIMESTAMP WHERE user_email=? AND {target}"
+
+
+def _prepare_update(kwargs):
+    """Validate and normalize update kwargs; return (sorted field names, values)."""
+    bad = kwargs.keys() - ALLOWED_UPDATE_FIELDS
+    if bad:
+        raise ValueError(f"Cannot update field(s): {', '.join(sorted(bad))}")
+    if "priority" in kwargs:
+        kwargs["priority"] = normalize_priority(kwargs["priority"])
+        kwargs["priority_rank"] = priority_rank(kwargs["priority"])
+    if "status" in kwargs:
+        kwargs["status"] = normalize_status(kwargs["status"])
+        kwargs["status_code"] = status_code(kwargs["status"])
+    field_key = tuple(sorted(kwargs))
+    return field_key, [kwargs[k] for k in field_key]
+
+
 def update_task(user_email, task_id, **kwargs):
     """Update a user's specific task."""
     if not kwargs:
         return
-    fields = ", ".join([f"{k}=?" for k in kwargs.keys()])
-    values = list(kwargs.values()) + [user_email, task_id]
+    field_key, values = _prepare_update(kwargs)
 
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        q = f"UPDATE tasks SET {fields}, updated_at=CURRENT_TIMESTAMP WHERE user_email=? AND task_id=?"
-        c.execute(q, values)
-        if c.rowcount == 0:
-            raise ValueError("Task not found or not owned by user.")
-        conn.commit()
+    conn = get_conn()
+    with transaction(conn):
+        _execute_owned(conn, _update_sql(field_key), values + [user_email, task_id])
+
+
+def update_tasks(user_email, updates):
+    """
+    Apply many per-task updates ({"task_id": ..., <fields>}) in one transaction.
+    An entry of {"task_id": ..., "delete": True} deletes that task instead.
+    All or nothing: an unknown field or a task the user doesn't own rolls back the batch.
+    """
+    prepared = []
+    for u in updates:
+        fields = dict(u)
+        task_id = fields.pop("task_id", None)
+        if task_id is None:
+            raise ValueError("Each update needs a task_id.")
+        if fields.pop("delete", False):
+            prepared.append((int(task_id), None, None))
+        elif fields:
+            prepared.append((int(task_id),) + _prepare_update(fields))
+    if not prepared:
+        return
+    conn = get_conn()
+    with transaction(conn):
+        for task_id, field_key, values in prepared:
+            if field_key is None:
+                _execute_owned(conn, SQL_DELETE_TASK, (user_email, task_id))
+            else:
+                _execute_owned(conn, _update_sql(field_key), values + [user_email, task_id])
+
+
+def update_tasks_bulk(user_email, task_ids, **kwargs):
+    """Apply the same column values to many of a user's tasks in one statement; returns rows changed."""
+    task_ids = [int(t) for t in task_ids]
+    if not kwargs or not task_ids:
+        return 0
+    field_key, values = _prepare_update(kwargs)
+
+    conn = get_conn()
+    with transaction(conn):
+        return conn.execute(_update_sql(field_key, bulk=True),
+                            values + [user_email, json.dumps(task_ids)]).rowcount
 
 
 # =====================================================
@@ -98,132 +406,335 @@ def mark_task_complete(user_email, task_id):
 # =====================================================
 # ❌ DELETE TASK
 # =====================================================
+SQL_DELETE_TASK = "DELETE FROM tasks WHERE user_email=? AND task_id=?"
+
+
 def delete_task(user_email, task_id):
     """Delete a user's specific task."""
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("DELETE FROM tasks WHERE user_email=? AND task_id=?", (user_email, task_id))
-        if c.rowcount == 0:
-            raise ValueError("Task not found or not owned by user.")
-        conn.commit()
+    conn = get_conn()
+    with transaction(conn):
+        _execute_owned(conn, SQL_DELETE_TASK, (user_email, task_id))
 
 
 # =====================================================
 # 📋 LIST TASKS
 # =====================================================
+_LIST_TASKS_BASE = """
+    SELECT task_id, title, description, category, due_date, priority,
+           reminder_days, status
+    FROM tasks
+    WHERE user_email=?
+"""
+# Fixed SQL text per sort order, built once, so SQLite's per-connection
+# statement cache reuses the prepared plan on every call.
+LIST_TASKS_QUERIES = {
+    None: _LIST_TASKS_BASE,
+    "due_date": _LIST_TASKS_BASE + " ORDER BY due_date",
+    "priority": _LIST_TASKS_BASE + " ORDER BY priority_rank DESC, due_date",
+    "category": _LIST_TASKS_BASE + " ORDER BY category",
+}
+
+
 def list_tasks(user_email, sort_by=None):
     """Fetch all tasks for a specific user."""
-    allowed_sort = {"due_date", "priority", "category"}
-    query = """
-        SELECT task_id, title, description, category, due_date, priority,
-               reminder_days, status
-        FROM tasks
-        WHERE user_email=?
-    """
-    if sort_by in allowed_sort:
-        query += f" ORDER BY {sort_by}"
+    query = LIST_TASKS_QUERIES.get(sort_by, LIST_TASKS_QUERIES[None])
+    return get_conn().execute(query, (user_email,)).fetchall()
+
+
+# Days left, the "Due" text and the date-driven priority are all produced by
+# SQLite, so the Python loop below only does dict lookups. Undated tasks keep
+# their stored priority.
+_VIEW_TASKS_BASE = """
+    SELECT task_id, title, COALESCE(category, ''), COALESCE(due_date, '—'), status,
+           CASE
+               WHEN days_left IS NULL THEN '—'
+               WHEN days_left < 0 THEN (-days_left) || ' days overdue'
+               WHEN days_left = 0 THEN 'Today'
+               ELSE 'In ' || days_left || ' days'
+           END AS due_text,
+           CASE
+               WHEN days_left IS NULL THEN priority
+               WHEN days_left <= 2 OR days_left <= reminder_days THEN 'High'
+               WHEN days_left <= 7 THEN 'Medium'
+               ELSE 'Low'
+           END AS eff_priority
+    FROM (
+        SELECT *, CAST(julianday(due_date) - julianday('now', 'localtime', 'start of day') AS INTEGER) AS days_left
+        FROM tasks {where}
+    )
+"""
+_VIEW_ORDER = {
+    None: "",
+    "due_date": " ORDER BY due_date",
+    "priority": " ORDER BY priority_rank DESC, due_date",
+    "category": " ORDER BY category",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _view_sql(scoped, sort_by):
+    where = "WHERE user_email=?" if scoped else ""
+    return _VIEW_TASKS_BASE.format(where=where) + _VIEW_ORDER.get(sort_by, "")
+
+
+# Colored labels built once; the view loop only looks them up
+PRIORITY_COLORED = {
+    "High": f"{Fore.RED}High{Style.RESET_ALL}",
+    "Medium": f"{Fore.YELLOW}Medium{Style.RESET_ALL}",
+    "Low": f"{Fore.GREEN}Low{Style.RESET_ALL}",
+}
+STATUS_COLORED = {
+    "Completed": f"{Fore.GREEN}Completed{Style.RESET_ALL}",
+    "Pending": f"{Fore.CYAN}Pending{Style.RESET_ALL}",
+}
+
+
+# Titles and especially categories repeat across rows
+_title_case = functools.lru_cache(maxsize=1024)(str.title)
+
+
+def view_tasks(sort_by=None, user_email=None):
+    """Print tasks as a table (all users when user_email is None)."""
+    params = (user_email,) if user_email else ()
+    rows = get_conn().execute(_view_sql(bool(user_email), sort_by), params).fetchall()
+    if not rows:
+        print("📭 No tasks found.")
+        return
+
+    table = (
+        [task_id, _title_case(title), _title_case(category), due_date, due_text,
+         PRIORITY_COLORED.get(eff_priority, eff_priority), STATUS_COLORED.get(status, status)]
+        for task_id, title, category, due_date, status, due_text, eff_priority in rows
+    )
+    headers = ["ID", "Title", "Category", "Due Date", "Due", "Priority", "Status"]
+    print(tabulate(table, headers, tablefmt="grid", disable_numparse=True))
 
-    with sqlite3.connect(DB_PATH) as conn:
-        rows = conn.execute(query, (user_email,)).fetchall()
 
-    return rows
+# =====================================================
+# 🧹 CLEAR ALL TASKS
+# =====================================================
+def clear_all_tasks(user_email=None):
+    """Delete every task (only this user's when user_email is given)."""
+    conn = get_conn()
+    with transaction(conn):
+        if user_email:
+            n = conn.execute("DELETE FROM tasks WHERE user_email=?", (user_email,)).rowcount
+        else:
+            n = conn.execute("DELETE FROM tasks").rowcount
+    print(f"🧹 Cleared {n} task(s).")
 
 
 # =====================================================
 # 📧 EMAIL REMINDERS
 # =====================================================
-def send_email_reminder(to_email, task):
-    """Send email reminder for an upcoming task."""
-    email_user = os.getenv("EMAIL_USER")
-    email_pass = os.getenv("EMAIL_PASS")
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
 
-    if not email_user or not email_pass:
-        print(f"⚠️ Email not sent for '{task['title']}' — credentials not set.")
-        return
 
-    subject = f"Reminder: {task['title']} due {task['due_date']}"
-    body = (
+def _build_reminder(email_user, to_email, task):
+    """Build the reminder message for one task."""
+    msg = EmailMessage()
+    msg.set_content(
         f"Task: {task['title']}\n"
         f"Description: {task['description']}\n"
         f"Due Date: {task['due_date']}\n"
         f"Priority: {task['priority']}"
     )
-
-    msg = EmailMessage()
-    msg.set_content(body)
-    msg["Subject"] = subject
+    msg["Subject"] = f"Reminder: {task['title']} due {task['due_date']}"
     msg["From"] = email_user
     msg["To"] = to_email
+    return msg
+
+
+def send_email_reminders(to_email, tasks):
+    """Send reminders for many tasks over one SMTP session (one TLS handshake + login)."""
+    if not tasks:
+        return
+    email_user = os.getenv("EMAIL_USER")
+    email_pass = os.getenv("EMAIL_PASS")
+
+    if not email_user or not email_pass:
+        print(f"⚠️ {len(tasks)} reminder(s) not sent — credentials not set.")
+        return
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
+        with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT) as server:
             server.login(email_user, email_pass)
-            server.send_message(msg)
-        print(f"📧 Reminder sent for '{task['title']}' to {to_email}")
+            for task in tasks:
+                try:
+                    server.send_message(_build_reminder(email_user, to_email, task))
+                    print(f"📧 Reminder sent for '{task['title']}' to {to_email}")
+                except smtplib.SMTPException as e:
+                    print(f"⚠️ Failed to send reminder for '{task['title']}': {e}")
     except Exception as e:
         print(f"⚠️ Failed to send email: {e}")
 
 
+def send_email_reminder(to_email, task):
+    """Send email reminder for an upcoming task."""
+    send_email_reminders(to_email, [task])
+
+
+EMAIL_CONCURRENCY = 8
+
+
+async def send_email_reminders_async(pairs, concurrency=EMAIL_CONCURRENCY):
+    """
+    Send (to_email, task) reminders over up to `concurrency` parallel SMTP
+    sessions, each logging in once and draining a shared queue, so server
+    round-trips overlap. Returns how many messages were sent.
+    """
+    if not pairs:
+        return 0
+    email_user = os.getenv("EMAIL_USER")
+    email_pass = os.getenv("EMAIL_PASS")
+    if not email_user or not email_pass:
+        print(f"⚠️ {len(pairs)} reminder(s) not sent — credentials not set.")
+        return 0
+
+    import aiosmtplib  # only needed on this path
+
+    queue = asyncio.Queue()
+    for pair in pairs:
+        queue.put_nowait(pair)
+
+    async def worker():
+        sent = 0
+        async with aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, use_tls=True) as server:
+            await server.login(email_user, email_pass)
+            while not queue.empty():
+                to_email, task = queue.get_nowait()
+                try:
+                    await server.send_message(_build_reminder(email_user, to_email, task))
+                    sent += 1
+                    print(f"📧 Reminder sent for '{task['title']}' to {to_email}")
+                except aiosmtplib.SMTPException as e:
+                    print(f"⚠️ Failed to send reminder for '{task['title']}': {e}")
+        return sent
+
+    workers = min(concurrency, len(pairs))
+    results = await asyncio.gather(*(worker() for _ in range(workers)), return_exceptions=True)
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"⚠️ Failed to send email: {r}")
+    return sum(r for r in results if isinstance(r, int))
+
+
+SQL_DUE_REMINDERS = """
+    SELECT title, description, due_date, priority FROM tasks
+    WHERE user_email=? AND status_code=0
+          AND date(due_date, '-' || COALESCE(reminder_days, 1) || ' days') <= date('now', 'localtime')
+          AND due_date >= date('now', 'localtime')
+    ORDER BY due_date
+"""
+
+
+def send_due_reminders(user_email):
+    """
+    Email every open task whose reminder window has started, fanned out over
+    parallel SMTP sessions. Sync entry point; returns how many were sent.
+    """
+    rows = get_conn().execute(SQL_DUE_REMINDERS, (user_email,)).fetchall()
+    return asyncio.run(send_email_reminders_async([(user_email, dict(r)) for r in rows]))
+
+
 # =====================================================
 # 🔁 RECURRING SUGGESTIONS (AI)
 # =====================================================
+# Keyword pre-filter: tasks with no recurrence hint never reach the model.
+# LIKE is case-insensitive for ASCII, so no LOWER() per row.
+SQL_RECURRING_ROWS = """
+    SELECT title, description, category, due_date, priority, reminder_days
+    FROM tasks WHERE user_email=? AND ({})
+""".format(" OR ".join(["title LIKE ? OR description LIKE ?"] * len(AUTO_RENEW_KEYWORDS)))
+_RECURRING_PARAMS = tuple(p for kw in AUTO_RENEW_KEYWORDS for p in (f"%{kw}%",) * 2)
+
+
 def get_recurring_suggestions(user_email):
     """Use AI to suggest recurring tasks for auto-addition."""
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("""
-            SELECT title, description, category, due_date, priority, reminder_days
-            FROM tasks WHERE user_email=?
-        """, (user_email,))
-        rows = c.fetchall()
-
-    suggestions = []
-    for row in rows:
-        title, description, category, due_date, priority, reminder_days = row
-        parsed_due_date = safe_parse_date(due_date)
-        if not parsed_due_date:
-            continue
-        if predict_auto_renew(title, description) == "Yes":
-            next_due_date = (parsed_due_date + timedelta(days=7)).strftime("%Y-%m-%d")
-            suggestions.append({
-                "title": title,
-                "description": description,
-                "category": category,
-                "due_date": next_due_date,
-                "priority": priority,
-                "reminder_days": reminder_days
-            })
-    return suggestions
+    rows = get_conn().execute(SQL_RECURRING_ROWS, (user_email,) + _RECURRING_PARAMS).fetchall()
+
+    dated = [row for row in rows if safe_parse_date(row["due_date"])]
+    if not dated:
+        return []
+    # Shift every due date a week in one vectorized step
+    next_due = (np.array([row["due_date"] for row in dated], dtype="datetime64[D]")
+                + np.timedelta64(7, "D")).astype(str).tolist()
+    flags = predict_auto_renew_batch([(row["title"], row["description"]) for row in dated])
+    return [
+        {
+            "title": row["title"],
+            "description": row["description"],
+            "category": row["category"],
+            "due_date": due,
+            "priority": row["priority"],
+            "reminder_days": row["reminder_days"],
+        }
+        for row, due, flag in zip(dated, next_due, flags)
+        if flag == "Yes"
+    ]
 
 
 # =====================================================
 # 📊 SUMMARY STATS
 # =====================================================
+# One scan: per-category counts, with the totals summed from the groups
+SQL_SUMMARY = """
+    SELECT
+        COALESCE(NULLIF(category, ''), 'Uncategorized') AS cat,
+        COUNT(*),
+        SUM(status_code),
+        -- CASE, not a bare comparison: an undated open task compares as NULL, and an
+        -- all-NULL group would make SUM() NULL
+        SUM(CASE WHEN status_code=0 AND due_date < ? THEN 1 ELSE 0 END)
+    FROM tasks WHERE user_email=?
+    GROUP BY cat
+"""
+SQL_UPCOMING_HIGH = """
+    SELECT title, due_date, status FROM tasks
+    WHERE user_email=? AND priority_rank=3 AND due_date >= ?
+          AND status_code=0
+    ORDER BY due_date LIMIT 3
+"""
+
+
+# user_email -> ((write version, today), expires_at, stats). The TTL bounds
+# staleness from writers outside this process (e.g. the CLI).
+SUMMARY_CACHE_TTL = 60
+_summary_cache = {}
+
+
 def get_summary_stats(user_email):
-    """Return basic summary stats for the user."""
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("""
-            SELECT
-                COUNT(*),
-                SUM(CASE WHEN LOWER(status)='completed' THEN 1 ELSE 0 END),
-                SUM(CASE WHEN LOWER(status)!='completed' AND due_date < DATE('now') THEN 1 ELSE 0 END)
-            FROM tasks WHERE user_email=?
-        """, (user_email,))
-        total, completed, overdue = c.fetchone()
-
-        c.execute("""
-            SELECT category, COUNT(*) FROM tasks
-            WHERE user_email=? GROUP BY category
-        """, (user_email,))
-        categories = {r[0] or "Uncategorized": r[1] for r in c.fetchall()}
-
-    return {
-        "total": total or 0,
-        "completed": completed or 0,
-        "overdue": overdue or 0,
-        "categories": categories
+    """Return basic summary stats for the user, aggregated entirely in SQL."""
+    today = datetime.now().date().isoformat()  # ISO strings compare like dates
+    token = (_write_version, today)
+    now = time.monotonic()
+    hit = _summary_cache.get(user_email)
+    if hit and hit[0] == token and hit[1] > now:
+        return hit[2]
+
+    c = get_conn().cursor()
+    c.execute(SQL_SUMMARY, (today, user_email))
+    total = completed = overdue = 0
+    categories = {}
+    for cat, n, done, late in c.fetchall():
+        categories[cat] = n
+        total += n
+        completed += done
+        overdue += late
+
+    c.execute(SQL_UPCOMING_HIGH, (user_email, today))
+    upcoming_high = [dict(r) for r in c.fetchall()]
+
+    stats = {
+        "total": total,
+        "completed": completed,
+        "overdue": overdue,
+        "categories": categories,
+        "upcoming_high": upcoming_high
     }
+    _summary_cache[user_email] = (token, now + SUMMARY_CACHE_TTL, stats)
+    return stats
 
 
 # =====================================================
@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend import ai_agent
+
+
+def test_rule_priority_ignores_keywords_inside_other_words():
+    for title in ("Pick up parent from airport", "Buy current example book",
+                  "Try a different torrent client", "Play billiards"):
+        assert ai_agent._rule_priority(title, "", None) is None, title
+
+
+def test_rule_priority_matches_whole_keywords_and_plurals():
+    for title in ("Pay rent", "Doctor visit", "Pay bills", "Team meetings"):
+        assert ai_agent._rule_priority(title, "", None).startswith("Priority: High"), title
+
+
+def test_effective_priority_counts_plural_keywords():
+    for title in ("Pay bills", "Team meetings", "Dentist appointments", "Exams week",
+                  "Card payments", "Grant deadlines", "Science projects"):
+        task = {"title": title, "description": "", "category": "", "due_date": None}
+        assert ai_agent.get_effective_priority(task)["priority"] == "High", title
+
+
+def test_safe_parse_date_accepts_unpadded_dates():
+    assert ai_agent.safe_parse_date("2025-1-5") == ai_agent.date(2025, 1, 5)
+    assert ai_agent.safe_parse_date("2025-01-05") == ai_agent.date(2025, 1, 5)
+    for bad in ("2025-02-30", "05/01/2025", "", None):
+        assert ai_agent.safe_parse_date(bad) is None, bad
+
+
+def test_effective_priority_reads_unpadded_due_date():
+    soon = ai_agent.date.today() + ai_agent.timedelta(days=1)
+    task = {"title": "Water plants", "due_date": f"{soon.year}-{soon.month}-{soon.day}"}
+    assert ai_agent.get_effective_priority(task)["priority"] == "High"
+
+
+def _collect(agen):
+    async def run():
+        return [part async for part in agen]
+    return asyncio.run(run())
+
+
+def _fake_stream(monkeypatch, deltas, fail):
+    class Chunk:
+        def __init__(self, text):
+            self.choices = [SimpleNamespace(delta=SimpleNamespace(content=text))]
+
+    async def chunks():
+        for text in deltas:
+            yield Chunk(text)
+        if fail:
+            raise RuntimeError("connection reset")
+
+    async def astream(messages):
+        return chunks()
+
+    remembered = []
+    monkeypatch.setattr(ai_agent, "_astream", astream)
+    monkeypatch.setattr(ai_agent, "_cached_priority", lambda key: (None, None))
+    monkeypatch.setattr(ai_agent, "_remember_priority", lambda *args: remembered.append(args))
+    return remembered
+
+
+def test_priority_stream_aborts_instead_of_returning_a_cut_off_reply(monkeypatch):
+    remembered = _fake_stream(monkeypatch, ["Priority: Me"], fail=True)
+    with pytest.raises(RuntimeError):
+        _collect(ai_agent.suggest_priority_stream("Plan picnic"))
+    assert remembered == []
+
+
+def test_priority_stream_falls_back_when_the_model_fails_up_front(monkeypatch):
+    remembered = _fake_stream(monkeypatch, [], fail=True)
+    parts = _collect(ai_agent.suggest_priority_stream("Plan picnic"))
+    assert len(parts) == 1 and "fallback" in parts[0]
+    assert remembered == []
@@ -0,0 +1,232 @@
+import sys
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from backend import task_manager as tm
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh, migrated database in a temp dir for each test."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tm, "DB_PATH", str(tmp_path / "tasks.db"))
+    tm.init_db()
+    yield
+    tm.close_all_conns()
+
+
+def test_summary_stats_undated_open_task_alone_in_category(db):
+    # Regression: the overdue SUM() was NULL for a group whose only open task has no due date
+    tm.add_task("u@x.com", "Someday", category="Ideas")
+
+    stats = tm.get_summary_stats("u@x.com")
+
+    assert stats["total"] == 1
+    assert stats["completed"] == 0
+    assert stats["overdue"] == 0
+    assert stats["categories"] == {"Ideas": 1}
+
+
+def test_init_db_migrates_pre_account_tasks_table(tmp_path, monkeypatch):
+    # Regression: the committed legacy schema has no user_email column
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "legacy.db"
+    monkeypatch.setattr(tm, "DB_PATH", str(path))
+    legacy = tm.sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE tasks (
+            task_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT,
+            category TEXT, due_date TEXT, duration REAL, priority TEXT, reminder_days INTEGER,
+            status TEXT DEFAULT 'Pending', created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP, recurring_rule TEXT, tags TEXT
+        )
+    """)
+    legacy.execute("INSERT INTO tasks (title, priority) VALUES ('Old task', 'High')")
+    legacy.commit()
+    legacy.close()
+
+    tm.init_db()
+    try:
+        tm.add_task("u@x.com", "New task")
+        assert [t["title"] for t in tm.list_tasks("u@x.com")] == ["New task"]
+    finally:
+        tm.close_all_conns()
+
+
+class _FakeSMTP:
+    """Stands in for aiosmtplib.SMTP; records every message sent."""
+    sent = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def login(self, user, password):
+        pass
+
+    async def send_message(self, msg):
+        self.sent.append(msg)
+
+
+def test_send_due_reminders_fans_out_over_async_smtp(db, monkeypatch):
+    monkeypatch.setitem(sys.modules, "aiosmtplib", SimpleNamespace(SMTP=_FakeSMTP, SMTPException=Exception))
+    monkeypatch.setattr(_FakeSMTP, "sent", [])
+    monkeypatch.setenv("EMAIL_USER", "bot@x.com")
+    monkeypatch.setenv("EMAIL_PASS", "secret")
+    soon = (date.today() + timedelta(days=1)).isoformat()
+    later = (date.today() + timedelta(days=30)).isoformat()
+    tm.add_task("u@x.com", "Pay rent", due_date=soon, reminder_days=2)
+    tm.add_task("u@x.com", "Call plumber", due_date=soon, reminder_days=2)
+    tm.add_task("u@x.com", "Renew passport", due_date=later, reminder_days=2)
+    tm.add_task("other@x.com", "Not mine", due_date=soon, reminder_days=2)
+
+    assert tm.send_due_reminders("u@x.com") == 2
+    assert sorted(m["Subject"] for m in _FakeSMTP.sent) == [
+        f"Reminder: Call plumber due {soon}", f"Reminder: Pay rent due {soon}"]
+    assert {m["To"] for m in _FakeSMTP.sent} == {"u@x.com"}
+
+
+def _titles(user_email):
+    return {t["title"]: dict(t) for t in tm.list_tasks(user_email)}
+
+
+def test_add_tasks_bulk_inserts_normalized_rows(db):
+    tm.add_tasks_bulk("u@x.com", [
+        {"title": "Pay rent", "priority": "high", "due_date": "2025-01-01"},
+        {"title": "Water plants", "status": "completed"},
+    ])
+    tm.add_tasks_bulk("u@x.com", [])
+
+    tasks = _titles("u@x.com")
+    assert set(tasks) == {"Pay rent", "Water plants"}
+    assert tasks["Pay rent"]["priority"] == "High"
+    assert tasks["Water plants"]["status"] == "Completed"
+    assert tasks["Water plants"]["reminder_days"] == 1
+    assert tm.list_tasks("other@x.com") == []
+
+
+def test_update_tasks_applies_updates_and_deletes(db):
+    tm.add_tasks_bulk("u@x.com", [{"title": "A"}, {"title": "B"}, {"title": "C"}])
+    ids = {t["title"]: t["task_id"] for t in tm.list_tasks("u@x.com")}
+
+    tm.update_tasks("u@x.com", [
+        {"task_id": ids["A"], "priority": "low", "status": "completed"},
+        {"task_id": ids["B"], "delete": True},
+    ])
+
+    tasks = _titles("u@x.com")
+    assert set(tasks) == {"A", "C"}
+    assert (tasks["A"]["priority"], tasks["A"]["status"]) == ("Low", "Completed")
+
+
+@pytest.mark.parametrize("bad_entry", [
+    {"delete": True},                      # no task_id
+    {"task_id": 9999, "title": "Ghost"},   # not found
+    {"task_id": "OTHER", "delete": True},  # another user's task
+    {"task_id": "A", "user_email": "x"},   # not an updatable field
+])
+def test_update_tasks_rolls_back_whole_batch(db, bad_entry):
+    tm.add_tasks_bulk("u@x.com", [{"title": "A"}, {"title": "B"}])
+    tm.add_task("o@x.com", "Theirs")
+    ids = {t["title"]: t["task_id"] for t in tm.list_tasks("u@x.com")}
+    ids["OTHER"] = tm.list_tasks("o@x.com")[0]["task_id"]
+    if bad_entry.get("task_id") in ids:
+        bad_entry = {**bad_entry, "task_id": ids[bad_entry["task_id"]]}
+
+    with pytest.raises(ValueError):
+        tm.update_tasks("u@x.com", [
+            {"task_id": ids["A"], "title": "A2"},
+            {"task_id": ids["B"], "delete": True},
+            bad_entry,
+        ])
+
+    assert set(_titles("u@x.com")) == {"A", "B"}
+    assert set(_titles("o@x.com")) == {"Theirs"}
+
+
+def test_update_task_rejects_unknown_field(db):
+    tm.add_task("u@x.com", "A")
+    task_id = tm.list_tasks("u@x.com")[0]["task_id"]
+
+    with pytest.raises(ValueError, match="priority_rank"):
+        tm.update_task("u@x.com", task_id, priority_rank=99)
+    with pytest.raises(ValueError):
+        tm.update_tasks_bulk("u@x.com", [task_id], status_code=1)
+
+
+def test_update_tasks_bulk_only_touches_owned_tasks(db):
+    tm.add_tasks_bulk("u@x.com", [{"title": "A"}, {"title": "B"}, {"title": "C"}])
+    tm.add_task("o@x.com", "Theirs")
+    ids = {t["title"]: t["task_id"] for t in tm.list_tasks("u@x.com")}
+    theirs = tm.list_tasks("o@x.com")[0]["task_id"]
+
+    changed = tm.update_tasks_bulk("u@x.com", [ids["A"], ids["B"], theirs], status="completed")
+
+    assert changed == 2
+    assert {t: r["status"] for t, r in _titles("u@x.com").items()} == {
+        "A": "Completed", "B": "Completed", "C": "Pending"}
+    assert _titles("o@x.com")["Theirs"]["status"] == "Pending"
+    assert tm.update_tasks_bulk("u@x.com", [], status="completed") == 0
+
+
+# ----------------- API routes -----------------
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from backend import api
+
+    with TestClient(api.app, headers={"X-User-Email": "u@x.com"}) as c:
+        yield c
+
+
+def test_tasks_pages_in_due_date_order(client):
+    tm.add_tasks_bulk("u@x.com", [
+        {"title": t, "due_date": d} for t, d in [
+            ("a", "2025-03-01"), ("b", None), ("c", "2025-01-01"),
+            ("d", "2025-01-01"), ("e", "2025-02-01")]])
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/tasks", params=params).json()
+        assert len(page["tasks"]) <= 2
+        seen += [t["title"] for t in page["tasks"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == ["b", "c", "d", "e", "a"]
+    assert client.get("/tasks", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_batch_routes_create_update_and_delete(client):
+    resp = client.post("/tasks/batch", json=[{"title": "A", "priority": "high"}, {"title": "B"}])
+    assert resp.status_code == 200
+    ids = {t["title"]: t["task_id"] for t in tm.list_tasks("u@x.com")}
+
+    resp = client.patch("/tasks/batch", json=[
+        {"task_id": ids["A"], "status": "completed"},
+        {"task_id": ids["B"], "delete": True},
+    ])
+    assert resp.status_code == 200
+    tasks = _titles("u@x.com")
+    assert set(tasks) == {"A"}
+    assert (tasks["A"]["priority"], tasks["A"]["status"]) == ("High", "Completed")
+
+
+def test_batch_routes_reject_bad_input(client):
+    tm.add_task("u@x.com", "A")
+    task_id = tm.list_tasks("u@x.com")[0]["task_id"]
+
+    assert client.post("/tasks/batch", json=[{"title": "X", "owner": "y"}]).status_code == 422
+    assert client.patch("/tasks/batch", json=[{"task_id": task_id, "bogus": 1}]).status_code == 400
+    assert client.patch("/tasks/batch", json=[{"task_id": 9999, "title": "Ghost"}]).status_code == 400
+    assert client.patch(f"/tasks/{task_id}", json={"user_email": "o@x.com"}).status_code == 400
+    assert set(_titles("u@x.com")) == {"A"}
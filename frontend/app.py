@@ -1,8 +1,10 @@
+import asyncio
+import hashlib
 import streamlit as st
-import requests
+import httpx
+import orjson
+import numpy as np
 import pandas as pd
-from streamlit_calendar import calendar as st_calendar
-import plotly.express as px
 import os
 
 # ====================================================
@@ -11,6 +13,14 @@ import os
 API_BASE = st.secrets.get("API_BASE") or os.environ.get("API_BASE") or "http://127.0.0.1:8000"
 st.set_page_config(page_title="Family Calendar AI", layout="wide")
 
+
+@st.cache_resource
+def http():
+    """One keep-alive HTTP client for the whole app, reused across reruns and sessions."""
+    # retries only re-attempt failed connects (e.g. the API restarting), never a sent request
+    transport = httpx.HTTPTransport(retries=2, limits=httpx.Limits(max_keepalive_connections=10))
+    return httpx.Client(base_url=API_BASE, timeout=5.0, transport=transport)
+
 st.title("🧭 Family Calendar AI")
 st.caption("Plan, track, and visualize your family’s schedule — all in one place.")
 
@@ -30,14 +40,14 @@ if not st.session_state["user_email"]:
 
     if mode == "Register":
         if st.button("Create Account"):
-            r = requests.post(f"{API_BASE}/auth/register", json={"email": email})
+            r = http().post("/auth/register", json={"email": email})
             if r.status_code == 200:
                 st.success("✅ Account created successfully! Please log in.")
             else:
-                st.error(r.json().get("detail", "Registration failed."))
+                st.error(orjson.loads(r.content).get("detail", "Registration failed."))
     else:
         if st.button("Login"):
-            r = requests.post(f"{API_BASE}/auth/login", json={"email": email})
+            r = http().post("/auth/login", json={"email": email})
             if r.status_code == 200:
                 st.session_state["user_email"] = email.strip().lower()
                 st.success(f"Welcome back, {email}! 🎉")
@@ -65,56 +75,197 @@ page = st.sidebar.radio("Go to", ["📅 Calendar", "📊 Analytics"])
 # ====================================================
 headers = {"X-User-Email": st.session_state["user_email"]}
 
-if page == "📅 Calendar":
-    try:
-        resp = requests.get(f"{API_BASE}/tasks", headers=headers)
-        tasks = resp.json().get("tasks", []) if resp.status_code == 200 else []
-    except Exception as e:
-        st.error(f"⚠️ Could not connect to backend: {e}")
-        tasks = []
 
-    if not tasks:
-        st.info("📭 No tasks yet. Add some below!")
-    else:
-        color_map = {"High": "#e74c3c", "Medium": "#f1c40f", "Low": "#2ecc71"}
-        events = [
-            {
-                "title": t["title"],
-                "start": t["due_date"],
-                "end": t["due_date"],
-                "color": color_map.get(t["priority"], "#95a5a6"),
-                "extendedProps": {
-                    "category": t["category"],
-                    "description": t["description"],
-                    "priority": t["priority"],
-                    "status": t["status"]
-                }
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_all_tasks(user_email):
+    """
+    Fetch every task for the user, following /tasks keyset pages.
+    Cached per user for 30s so widget reruns don't refetch; mutations call
+    invalidate_tasks().
+    Returns (tasks, fingerprint): a blake2b digest of the raw response bytes
+    that the derived caches below key on instead of re-hashing the list.
+    Raises on any failed page, so errors are never cached.
+    """
+    tasks, cursor, digest = [], None, hashlib.blake2b(digest_size=8)
+    while True:
+        params = {"limit": 500}
+        if cursor:
+            params["cursor"] = cursor
+        resp = http().get("/tasks", headers={"X-User-Email": user_email}, params=params)
+        # Raise rather than return what we have: cache_data would keep a partial list for 30s
+        resp.raise_for_status()
+        digest.update(resp.content)
+        page = orjson.loads(resp.content)
+        tasks.extend(page.get("tasks", []))
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return tasks, digest.digest()
+
+
+@st.cache_data(ttl=60, show_spinner="Generating summary…")
+def fetch_ai_summary(user_email):
+    """/ai/summary for the user; repeat clicks within a minute reuse the last LLM reply."""
+    resp = http().get("/ai/summary", headers={"X-User-Email": user_email}, timeout=60.0)
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    if not data.get("stats"):
+        # The API reports LLM failures in-band; raise so the error isn't cached
+        raise RuntimeError(data.get("summary") or "Could not fetch summary.")
+    return data
+
+
+def invalidate_tasks():
+    """Drop everything derived from the task list after a successful write."""
+    fetch_all_tasks.clear()
+    fetch_ai_summary.clear()
+
+
+# Widget option lists are built once per process, not on every rerun
+PRIORITIES = ("Low", "Medium", "High")
+PRIORITY_INDEX = {p: i for i, p in enumerate(PRIORITIES)}
+STATUSES = ("Pending", "Completed")
+QUICK_ACTIONS = ("None", "➕ Add Task", "✏️ Update Task", "🗑️ Delete Task", "🤖 AI Tools")
+DATE_PRESETS = ("Last 7 days", "Last 30 days", "Last 90 days", "All time")
+PRIORITY_COLORS = {"High": "#e74c3c", "Medium": "#f1c40f", "Low": "#2ecc71"}
+PRIORITY_EMOJI = {"High": "🔴 High", "Medium": "🟡 Medium", "Low": "🟢 Low"}
+RECURRING_PATTERN = "weekly|every"  # same keywords the Analytics "Recurring" KPI has always used
+CALENDAR_OPTIONS = {
+    "initialView": "dayGridMonth",
+    "headerToolbar": {
+        "left": "prev,next today",
+        "center": "title",
+        "right": "dayGridMonth,timeGridWeek,timeGridDay"
+    },
+    "height": 650,
+}
+
+
+@st.cache_data(show_spinner=False)
+def build_events(tasks_fp, _tasks):
+    """Calendar events for the tasks; recomputed only when the fingerprint changes."""
+    return [
+        {
+            "title": t["title"],
+            "start": t["due_date"],
+            "end": t["due_date"],
+            "color": PRIORITY_COLORS.get(t["priority"], "#95a5a6"),
+            "extendedProps": {
+                "category": t["category"],
+                "description": t["description"],
+                "priority": t["priority"],
+                "status": t["status"]
             }
-            for t in tasks if t.get("due_date")
-        ]
-
-        calendar_options = {
-            "initialView": "dayGridMonth",
-            "headerToolbar": {
-                "left": "prev,next today",
-                "center": "title",
-                "right": "dayGridMonth,timeGridWeek,timeGridDay"
-            },
-            "height": 650,
         }
-
-        st_calendar(events=events, options=calendar_options, key="calendar_ui")
-        st.markdown("🟢 **Low** 🟡 **Medium** 🔴 **High**")
+        for t in _tasks if t.get("due_date")
+    ]
+
+
+class UncachedReply(Exception):
+    """A usable reply that must not be memoized (the backend's local fallback)."""
+
+    def __init__(self, reply):
+        super().__init__(reply)
+        self.reply = reply
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def ai_priority(title, description, due_date):
+    """
+    Stream the AI priority reply into the page; repeat clicks on the same task text replay it.
+    Raises (so nothing is cached) when the stream breaks off, and raises UncachedReply
+    for fallback replies produced while the model was unavailable.
+    """
+    payload = {"title": title, "description": description, "due_date": due_date}
+    with http().stream("POST", "/ai/priority/stream", json=payload, timeout=30.0) as resp:
+        resp.raise_for_status()
+        placeholder, reply = st.empty(), ""
+        for chunk in resp.iter_text():
+            reply += chunk
+            placeholder.markdown(f"🧠 {reply}")
+    if "fallback" in reply:
+        raise UncachedReply(reply)
+    return reply
+
+
+def priority_from_reply(reply):
+    """'Priority: High\nReason: ...' -> 'High' (Medium when unparseable), like the backend."""
+    level = reply.split("\n")[0].replace("Priority:", "").strip()
+    return level if level in PRIORITY_INDEX else "Medium"
+
+
+@st.cache_data(show_spinner=False)
+def task_labels(tasks_fp, _tasks):
+    """'Title (ID: n)' -> task, shared by the Update and Delete pickers."""
+    return {f"{t['title']} (ID: {t['task_id']})": t for t in _tasks}
+
+
+@st.cache_data(show_spinner=False)
+def tasks_frame(tasks_fp, _tasks):
+    """Tasks as a DataFrame with parsed due dates, sorted by due date (undated last)."""
+    df = pd.DataFrame(_tasks)
+    df["due_date"] = pd.to_datetime(df["due_date"], format="ISO8601", errors="coerce")
+    # Low-cardinality labels as int8-coded categoricals for the KPI masks and charts;
+    # titles Arrow-backed so the recurring-keyword scan runs in Arrow's string kernels
+    df = df.astype({"priority": "category", "status": "category", "category": "category",
+                    "title": "string[pyarrow]"})
+    # Recurring flag is data-only, so it is scanned once here rather than on every filter change
+    df["recurring"] = df["title"].str.contains(RECURRING_PATTERN, case=False, na=False).to_numpy(dtype=bool)
+    return df.sort_values("due_date", na_position="last", ignore_index=True)
+
+
+# Figures are built from pre-counted values (one row per label, not per task) and
+# cached on those counts, so reruns with the same filtered data skip Plotly figure
+# construction. They are cached as JSON text: a string is far cheaper for
+# cache_data to copy out than a pickled Figure.
+@st.cache_data(show_spinner=False)
+def priority_chart(counts):
+    import plotly.express as px  # Analytics-only; kept off the Calendar cold start
+    names = counts.index.astype(str)
+    return px.pie(names=names, values=counts.to_numpy(), title="Priority Distribution", hole=0.4).to_json()
+
+
+@st.cache_data(show_spinner=False)
+def status_chart(counts):
+    import plotly.express as px
+    names = counts.index.astype(str)
+    return px.bar(
+        x=names, y=counts.to_numpy(), color=names, text=counts.to_numpy(), title="Status Overview",
+        labels={"x": "status", "y": "count", "color": "status"},
+    ).to_json()
+
+
+async def _get_all(paths, headers, timeout):
+    async with httpx.AsyncClient(base_url=API_BASE, headers=headers, timeout=timeout) as client:
+        return await asyncio.gather(*(client.get(p) for p in paths))
+
+
+def fetch_parallel(paths, headers, timeout=60.0):
+    """GET several independent endpoints at once; total wait is the slowest, not the sum."""
+    return asyncio.run(_get_all(paths, headers, timeout))
+
+
+# Typing in a form, picking a task or queueing a change reruns only this fragment,
+# not the calendar. A successful write clears the task caches and reruns the whole
+# app once, so the calendar and the "no tasks" banner above reflect it; the success
+# message is carried across that rerun in session_state["flash"].
+@st.fragment
+def quick_actions():
+    try:
+        tasks, tasks_fp = fetch_all_tasks(st.session_state["user_email"])
+    except Exception:
+        tasks, tasks_fp = [], b""
 
     # ----------------------------------------------------
     # QUICK ACTIONS
     # ----------------------------------------------------
     st.markdown("---")
     st.subheader("⚡ Quick Actions")
+    if "flash" in st.session_state:
+        st.success(st.session_state.pop("flash"))
 
     action = st.selectbox(
         "Select Action",
-        ["None", "➕ Add Task", "✏️ Update Task", "🗑️ Delete Task", "🤖 AI Tools"],
+        QUICK_ACTIONS,
         index=0,
     )
 
@@ -125,44 +276,84 @@ if page == "📅 Calendar":
         description = st.text_area("Description")
         category = st.text_input("Category")
         due_date = st.date_input("Due Date", value=None)
-        due_date = due_date.strftime("%Y-%m-%d") if due_date else None
+        due_date = due_date.isoformat() if due_date else None
 
         if st.button("Suggest Priority 🤖"):
-            try:
-                payload = {"title": title, "description": description, "due_date": due_date}
-                resp = requests.post(f"{API_BASE}/ai/priority", json=payload)
-                if resp.status_code == 200:
-                    result = resp.json()
-                    st.session_state["ai_priority"] = result.get("priority", "Medium")
+            if not title.strip():
+                st.warning("⚠️ Enter a title first.")
+            else:
+                try:
+                    try:
+                        reply = ai_priority(title.strip().lower(), description.strip().lower(), due_date)
+                    except UncachedReply as e:
+                        reply = e.reply
+                    st.session_state["ai_priority"] = priority_from_reply(reply)
                     st.info(f"🧠 Suggested Priority: **{st.session_state['ai_priority']}**")
-                else:
-                    st.warning("⚠️ AI could not suggest priority.")
-            except Exception as e:
-                st.error(f"AI Error: {e}")
+                except Exception as e:
+                    st.error(f"AI Error: {e}")
 
         priority = st.selectbox(
             "Priority",
-            ["Low", "Medium", "High"],
-            index=["Low", "Medium", "High"].index(st.session_state.get("ai_priority", "Medium")),
+            PRIORITIES,
+            index=PRIORITY_INDEX.get(st.session_state.get("ai_priority"), 1),
         )
         reminder_days = st.number_input("Reminder Days", min_value=0, value=1, step=1)
 
         if st.button("✅ Add Task"):
-            data = {
-                "title": title,
-                "description": description,
-                "category": category,
-                "due_date": due_date,
-                "priority": priority,
-                "reminder_days": reminder_days,
-            }
-            r = requests.post(f"{API_BASE}/tasks", json=data, headers=headers)
-            if r.status_code == 200:
-                st.success("✅ Task added successfully!")
-                st.session_state.pop("ai_priority", None)
-                st.rerun()
+            # Catch a blank title here instead of spending a round-trip on an untitled task
+            if not title.strip():
+                st.warning("⚠️ Please enter a title.")
             else:
-                st.error(f"⚠️ Failed to add task ({r.status_code})")
+                data = {
+                    "title": title,
+                    "description": description,
+                    "category": category,
+                    "due_date": due_date,
+                    "priority": priority,
+                    "reminder_days": reminder_days,
+                }
+                r = http().post("/tasks", json=data, headers=headers)
+                if r.status_code == 200:
+                    st.session_state["flash"] = "✅ Task added successfully!"
+                    st.session_state.pop("ai_priority", None)
+                    invalidate_tasks()
+                    st.rerun()
+                else:
+                    st.error(f"⚠️ Failed to add task ({r.status_code})")
+
+    # ----------------------------- UPDATE TASK -----------------------------
+    elif action == "✏️ Update Task":
+        if not tasks:
+            st.info("No tasks to update.")
+        else:
+            st.markdown("### ✏️ Update Tasks")
+            task_by_label = task_labels(tasks_fp, tasks)
+            task = task_by_label[st.selectbox("Select Task", list(task_by_label.keys()), key="update_select")]
+            new_title = st.text_input("Title", value=task["title"], key=f"update_title_{task['task_id']}")
+            new_priority = st.selectbox(
+                "Priority", PRIORITIES,
+                index=PRIORITY_INDEX.get(task["priority"], 1),
+                key=f"update_priority_{task['task_id']}",
+            )
+            new_status = st.selectbox(
+                "Status", STATUSES,
+                index=1 if task["status"] == "Completed" else 0,
+                key=f"update_status_{task['task_id']}",
+            )
+
+            pending = st.session_state.setdefault("pending_updates", [])
+            if st.button("➕ Queue Update"):
+                changes = {k: v for k, v in {"title": new_title, "priority": new_priority, "status": new_status}.items()
+                           if v != task.get(k)}
+                if not new_title.strip():
+                    st.warning("⚠️ Title can't be empty.")
+                elif {"task_id": task["task_id"], "delete": True} in pending:
+                    st.warning(f"Task {task['task_id']} is already queued for deletion.")
+                elif changes:
+                    pending.append({"task_id": task["task_id"], **changes})
+                    st.success(f"Queued changes for task {task['task_id']}.")
+                else:
+                    st.info("Nothing changed.")
 
     # ----------------------------- DELETE TASK -----------------------------
     elif action == "🗑️ Delete Task":
@@ -170,17 +361,90 @@ if page == "📅 Calendar":
             st.info("No tasks to delete.")
         else:
             st.markdown("### 🗑️ Delete a Task")
-            task_choices = {f"{t['title']} (ID: {t['task_id']})": t["task_id"] for t in tasks}
-            selected_task = st.selectbox("Select Task", list(task_choices.keys()))
-            task_id = task_choices[selected_task]
+            task_by_label = task_labels(tasks_fp, tasks)
+            selected_task = st.selectbox("Select Task", list(task_by_label.keys()))
+            task_id = task_by_label[selected_task]["task_id"]
+            if st.button("➕ Queue Delete"):
+                # Edits queued for the task are moot once it's deleted; keep just the delete
+                st.session_state["pending_updates"] = [
+                    u for u in st.session_state.get("pending_updates", []) if u["task_id"] != task_id
+                ] + [{"task_id": task_id, "delete": True}]
+                st.success(f"Queued task {task_id} for deletion.")
             if st.button("🧹 Confirm Delete"):
-                resp = requests.delete(f"{API_BASE}/tasks/{task_id}", headers=headers)
+                resp = http().delete(f"/tasks/{task_id}", headers=headers)
                 if resp.status_code == 200:
-                    st.success("🗑️ Task deleted successfully!")
+                    # Anything still queued for this task would fail the whole batch
+                    st.session_state["pending_updates"] = [
+                        u for u in st.session_state.get("pending_updates", []) if u["task_id"] != task_id
+                    ]
+                    st.session_state["flash"] = "🗑️ Task deleted successfully!"
+                    invalidate_tasks()
                     st.rerun()
                 else:
                     st.error("⚠️ Failed to delete task.")
 
+    # ----------------------------- AI TOOLS -----------------------------
+    elif action == "🤖 AI Tools":
+        st.markdown("### 🤖 AI Tools")
+        if st.button("🔍 Analyze My Tasks"):
+            try:
+                sugg_resp, summary_resp = fetch_parallel(["/ai/suggestions", "/ai/summary"], headers)
+            except Exception as e:
+                st.error(f"AI Error: {e}")
+            else:
+                if summary_resp.status_code == 200:
+                    st.markdown(orjson.loads(summary_resp.content).get("summary", ""))
+                suggestions = orjson.loads(sugg_resp.content).get("suggestions", []) if sugg_resp.status_code == 200 else []
+                if suggestions:
+                    st.markdown("**🔁 Likely recurring tasks for next week:**")
+                    df_sugg = pd.DataFrame(suggestions)[["title", "category", "due_date", "priority"]]
+                    df_sugg["priority"] = df_sugg["priority"].map(PRIORITY_EMOJI).fillna(df_sugg["priority"])
+                    st.dataframe(df_sugg, hide_index=True, use_container_width=True)
+                else:
+                    st.info("📭 No recurring tasks detected.")
+
+    # ----------------------------- PENDING CHANGES -----------------------------
+    # Queued edits and deletes are sent together in one PATCH /tasks/batch
+    # (one transaction, one cache refresh) instead of a request plus refetch each
+    pending = st.session_state.get("pending_updates")
+    if pending and tasks_fp:
+        # Drop entries for tasks that no longer exist (deleted elsewhere); they'd fail the batch
+        live_ids = {t["task_id"] for t in tasks}
+        pending = st.session_state["pending_updates"] = [u for u in pending if u["task_id"] in live_ids]
+    if pending and action in ("✏️ Update Task", "🗑️ Delete Task"):
+        st.caption(f"📝 {len(pending)} pending change(s)")
+        save_col, discard_col = st.columns(2)
+        if discard_col.button("🗑️ Discard Queued Changes"):
+            st.session_state["pending_updates"] = []
+            st.rerun(scope="fragment")
+        if save_col.button("💾 Save Changes"):
+            resp = http().patch("/tasks/batch", json=pending, headers=headers)
+            if resp.status_code == 200:
+                st.session_state["pending_updates"] = []
+                st.session_state["flash"] = "✅ Changes saved!"
+                invalidate_tasks()
+                st.rerun()
+            else:
+                st.error(f"⚠️ Failed to save changes: {orjson.loads(resp.content).get('detail', resp.status_code)}")
+
+
+if page == "📅 Calendar":
+    try:
+        tasks, tasks_fp = fetch_all_tasks(st.session_state["user_email"])
+    except Exception as e:
+        st.error(f"⚠️ Could not connect to backend: {e}")
+        tasks, tasks_fp = [], b""
+
+    if not tasks:
+        st.info("📭 No tasks yet. Add some below!")
+    else:
+        events = build_events(tasks_fp, tasks)
+        from streamlit_calendar import calendar as st_calendar
+        st_calendar(events=events, options=CALENDAR_OPTIONS, key="calendar_ui")
+        st.markdown("🟢 **Low** 🟡 **Medium** 🔴 **High**")
+
+    quick_actions()
+
 
 # ====================================================
 # 📊 ANALYTICS PAGE
@@ -189,18 +453,15 @@ elif page == "📊 Analytics":
     st.header("📊 Analytics Dashboard")
 
     try:
-        resp = requests.get(f"{API_BASE}/tasks", headers=headers)
-        tasks = resp.json().get("tasks", []) if resp.status_code == 200 else []
+        tasks, tasks_fp = fetch_all_tasks(st.session_state["user_email"])
     except Exception as e:
         st.error(f"⚠️ Could not load tasks: {e}")
-        tasks = []
+        tasks, tasks_fp = [], b""
 
     if not tasks:
         st.info("📭 No data available for analytics.")
     else:
-        df = pd.DataFrame(tasks)
-        if "due_date" in df.columns:
-            df["due_date"] = pd.to_datetime(df["due_date"], errors="coerce")
+        df = tasks_frame(tasks_fp, tasks)
 
         today = pd.Timestamp.today().normalize()
         st.markdown("### 📆 Filter by Due Date Range")
@@ -209,7 +470,7 @@ elif page == "📊 Analytics":
         if pd.isna(min_date): min_date = today - pd.Timedelta(days=30)
         if pd.isna(max_date): max_date = today
 
-        preset = st.selectbox("Preset Range", ["Last 7 days", "Last 30 days", "Last 90 days", "All time"], index=1)
+        preset = st.selectbox("Preset Range", DATE_PRESETS, index=1)
         if preset == "Last 7 days":
             start_date, end_date = today - pd.Timedelta(days=7), today
         elif preset == "Last 90 days":
@@ -220,13 +481,22 @@ elif page == "📊 Analytics":
             start_date, end_date = today - pd.Timedelta(days=30), today
 
         start_date, end_date = st.date_input("Custom date range:", value=(start_date, end_date), min_value=min_date, max_value=max_date)
-        df_filtered = df[(df["due_date"] >= pd.to_datetime(start_date)) & (df["due_date"] <= pd.to_datetime(end_date))].copy()
+        # Rows are sorted by due date, so the range is a slice between two binary searches
+        bounds = np.array([np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, "D")])
+        lo, hi = np.searchsorted(df["due_date"].to_numpy(), bounds)
+        df_filtered = df.iloc[lo:hi]
 
         if not df_filtered.empty:
+            # Status is categorical, so value_counts is a bincount over its codes and the
+            # "completed" check runs once per category instead of once per row
+            past_due = df_filtered["due_date"].to_numpy() < np.datetime64(today)
+            status_counts = df_filtered["status"].value_counts()
+            past_due_counts = df_filtered["status"][past_due].value_counts()
+
             total = len(df_filtered)
-            completed = len(df_filtered[df_filtered["status"].str.lower() == "completed"])
-            overdue = len(df_filtered[(df_filtered["due_date"] < today) & (df_filtered["status"].str.lower() != "completed")])
-            recurring = len(df_filtered[df_filtered["title"].str.contains("weekly|every", case=False, na=False)])
+            completed = int(status_counts[status_counts.index.str.lower() == "completed"].sum())
+            overdue = int(past_due_counts[past_due_counts.index.str.lower() != "completed"].sum())
+            recurring = np.count_nonzero(df_filtered["recurring"].to_numpy())
 
             col1, col2, col3 = st.columns(3)
             col1.metric("✅ Completion Rate", f"{(completed/total)*100:.1f}%")
@@ -235,8 +505,9 @@ elif page == "📊 Analytics":
 
             st.subheader("📊 Task Distribution")
             if "priority" in df_filtered.columns:
-                st.plotly_chart(px.pie(df_filtered, names="priority", title="Priority Distribution", hole=0.4), use_container_width=True)
-            st.plotly_chart(px.bar(df_filtered, x="status", color="status", title="Status Overview", text_auto=True), use_container_width=True)
+                priority_counts = df_filtered["priority"].value_counts()
+                st.plotly_chart(orjson.loads(priority_chart(priority_counts[priority_counts > 0])), use_container_width=True)
+            st.plotly_chart(orjson.loads(status_chart(status_counts[status_counts > 0])), use_container_width=True)
 
 
 # ====================================================
@@ -247,18 +518,13 @@ st.subheader("🧠 AI Summary")
 
 if st.button("✨ Generate Smart Summary"):
     try:
-        resp = requests.get(f"{API_BASE}/ai/summary", headers=headers)
-        if resp.status_code == 200:
-            data = resp.json()
-            st.success("✅ Summary generated!")
-            st.markdown(data.get("summary", ""))
-            stats = data.get("stats", {})
-            if stats:
-                col1, col2, col3 = st.columns(3)
-                col1.metric("🗂️ Total", stats.get("total", 0))
-                col2.metric("✅ Completed", stats.get("completed", 0))
-                col3.metric("⚠️ Overdue", stats.get("overdue", 0))
-        else:
-            st.error("⚠️ Could not fetch summary.")
+        data = fetch_ai_summary(st.session_state["user_email"])
+        st.success("✅ Summary generated!")
+        st.markdown(data.get("summary", ""))
+        stats = data.get("stats", {})
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🗂️ Total", stats.get("total", 0))
+        col2.metric("✅ Completed", stats.get("completed", 0))
+        col3.metric("⚠️ Overdue", stats.get("overdue", 0))
     except Exception as e:
         st.error(f"Error fetching summary: {e}")